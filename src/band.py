@@ -18,13 +18,14 @@
 
 from __future__ import annotations
 
+import math
+from functools import cached_property
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 import constants
 import convolve
-import terms
 import utils
 from line import Line
 from simtype import SimType
@@ -50,9 +51,72 @@ class Band:
         self.v_qn_up: int = v_qn_up
         self.v_qn_lo: int = v_qn_lo
         self.band_origin: float = self.get_band_origin()
-        self.rot_part: float = self.get_rot_partition_fn()
         self.vib_boltz_frac: float = self.get_vib_boltz_frac()
-        self.lines: list[Line] = self.get_lines()
+        self.franck_condon: float = sim.franck_condon[v_qn_up, v_qn_lo]
+
+        # The rotational line data is stored in structure-of-arrays form, with one entry per line.
+        # The quantum numbers are identical for every band in the simulation and are therefore
+        # shared with the parent simulation.
+        line_index: dict[str, NDArray] = sim.line_index
+        self.n_qn_up: NDArray[np.int64] = line_index["n_qn_up"]
+        self.n_qn_lo: NDArray[np.int64] = line_index["n_qn_lo"]
+        self.j_qn_up: NDArray[np.int64] = line_index["j_qn_up"]
+        self.j_qn_lo: NDArray[np.int64] = line_index["j_qn_lo"]
+        self.branch_idx_up: NDArray[np.int64] = line_index["branch_idx_up"]
+        self.branch_idx_lo: NDArray[np.int64] = line_index["branch_idx_lo"]
+        self.branch_name: NDArray[np.str_] = line_index["branch_name"]
+        self.is_satellite: NDArray[np.bool_] = line_index["is_satellite"]
+        self.rot_terms_up: NDArray[np.float64] = sim.rotational_terms(True, v_qn_up)
+        self.rot_terms_lo: NDArray[np.float64] = sim.rotational_terms(False, v_qn_lo)
+        self.wavenumbers: NDArray[np.float64] = self.get_wavenumbers()
+        self.honl_london_factors: NDArray[np.float64] = sim.honl_london_factors
+        self.rot_boltz_fracs: NDArray[np.float64] = self.get_rot_boltz_fracs()
+        self.intensities: NDArray[np.float64] = self.get_intensities()
+
+        # Convolved spectra are expensive to compute and are often requested several times with the
+        # same arguments (e.g. once to find the maximum intensity and again to plot), so they are
+        # memoized here. Nothing that they depend on changes after the band is created, so the cache
+        # never needs to be invalidated.
+        self.conv_cache: dict[tuple, NDArray[np.float64]] = {}
+
+    @cached_property
+    def lines(self) -> list[Line]:
+        """Return a list of all allowed rotational lines.
+
+        The line data is already stored by the band, so `Line` objects are only created the first
+        time they are requested (e.g. for tables or labels) rather than for every band.
+
+        Returns:
+            list[Line]: A list of all allowed `Line` objects for the given selection rules.
+        """
+        return [Line(band=self, idx=idx) for idx in range(self.wavenumbers.size)]
+
+    @cached_property
+    def line_lookup(self) -> dict[tuple[str, int, int, bool], int]:
+        """Return the index of each rotational line keyed by its identifying quantum numbers.
+
+        Satellite lines in different upper state branches can share a key, in which case the first
+        one is kept.
+
+        Returns:
+            dict[tuple[str, int, int, bool], int]: The index of each line within the band arrays,
+                keyed by branch name, lower state branch index, N'', and whether the line is a
+                satellite.
+        """
+        line_lookup: dict[tuple[str, int, int, bool], int] = {}
+
+        for idx, key in enumerate(
+            zip(
+                self.branch_name.tolist(),
+                self.branch_idx_lo.tolist(),
+                self.n_qn_lo.tolist(),
+                self.is_satellite.tolist(),
+                strict=True,
+            )
+        ):
+            line_lookup.setdefault(key, idx)
+
+        return line_lookup
 
     def wavenumbers_line(self) -> NDArray[np.float64]:
         """Return an array of wavenumbers, one for each line.
@@ -61,7 +125,7 @@ class Band:
             NDArray[np.float64]: All discrete rotational line wavenumbers belonging to the
                 vibrational band.
         """
-        return np.array([line.wavenumber for line in self.lines])
+        return self.wavenumbers
 
     def intensities_line(self) -> NDArray[np.float64]:
         """Return an array of intensities, one for each line.
@@ -69,7 +133,7 @@ class Band:
         Returns:
             NDArray[np.float64]: All rotational line intensities belonging to the vibrational band.
         """
-        return np.array([line.intensity for line in self.lines])
+        return self.intensities
 
     def wavenumbers_conv(self, inst_broadening_wl: float, granularity: int) -> NDArray[np.float64]:
         """Return an array of convolved wavenumbers.
@@ -81,18 +145,32 @@ class Band:
         Returns:
             NDArray[np.float64]: A continuous range of wavenumbers.
         """
+        key: tuple = ("wavenumbers", inst_broadening_wl, granularity)
+
+        if key in self.conv_cache:
+            return self.conv_cache[key]
+
         # A qualitative amount of padding added to either side of the x-axis limits. Ensures that
         # spectral features at either extreme are not clipped when the FWHM parameters are large.
         # The first line's instrument FWHM is chosen as an arbitrary reference to keep things
         # simple. The minimum Gaussian FWHM allowed is 2 to ensure that no clipping is encountered.
-        padding: float = 10.0 * max(self.lines[0].fwhm_instrument(True, inst_broadening_wl), 2)
+        padding: float = 10.0 * max(
+            utils.bandwidth_wavelen_to_wavenum(
+                utils.wavenum_to_wavelen(self.wavenumbers[0]), inst_broadening_wl
+            ),
+            2,
+        )
 
         # The individual line wavenumbers are only used to find the minimum and maximum bounds of
         # the spectrum since the spectrum itself is no longer quantized.
         wns_line: NDArray[np.float64] = self.wavenumbers_line()
 
         # Generate a fine-grained x-axis using existing wavenumber data.
-        return np.linspace(wns_line.min() - padding, wns_line.max() + padding, granularity)
+        wavenumbers_conv: NDArray[np.float64] = np.linspace(
+            wns_line.min() - padding, wns_line.max() + padding, granularity
+        )
+
+        return self.cache_conv(key, wavenumbers_conv)
 
     def intensities_conv(
         self,
@@ -110,13 +188,210 @@ class Band:
         Returns:
             NDArray[np.float64]: A continuous range of intensities.
         """
-        return convolve.convolve(
-            self.lines,
+        # The wavenumber grid is always evenly spaced, so its endpoints and size identify it exactly
+        # without copying or hashing the whole array.
+        key: tuple = (
+            "intensities",
+            tuple(fwhm_selections.items()),
+            inst_broadening_wl,
+            float(wavenumbers_conv[0]),
+            float(wavenumbers_conv[-1]),
+            wavenumbers_conv.size,
+        )
+
+        if key in self.conv_cache:
+            return self.conv_cache[key]
+
+        intensities_conv: NDArray[np.float64] = convolve.convolve(
+            self,
             wavenumbers_conv,
             fwhm_selections,
             inst_broadening_wl,
         )
 
+        return self.cache_conv(key, intensities_conv)
+
+    def cache_conv(self, key: tuple, data: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Store convolved data in the cache and return it.
+
+        Args:
+            key (tuple): The arguments used to compute the data.
+            data (NDArray[np.float64]): Convolved wavenumbers or intensities.
+
+        Returns:
+            NDArray[np.float64]: The cached data, which is made read-only so that callers cannot
+                modify the cached values in place.
+        """
+        data.flags.writeable = False
+        self.conv_cache[key] = data
+
+        return data
+
+    def fwhm_predissociation(self, is_selected: bool) -> NDArray[np.float64]:
+        """Return the predissociation broadening FWHM of each line in [1/cm].
+
+        The predissociation FWHM linewidths are computed using a polynomial fit given in the 1985
+        paper "Rotational Variation of Predissociation Linewidths in the Schumann-Runge Bands of O2"
+        by B. R. Lewis et al.
+
+        Args:
+            is_selected (bool): True if predissociation broadening should be simulated.
+
+        Returns:
+            NDArray[np.float64]: The predissociation broadening FWHM in [1/cm].
+        """
+        if is_selected:
+            # TODO: 24/10/25 - Using the polynomial fit and coefficients described by Lewis, 1986
+            #       for the predissociation of all bands for now. The goal is to use experimental
+            #       values when available, and use this fit otherwise. The fit is good up to J = 40
+            #       and v = 21. Check this to make sure v' and J' should be used even in absorption.
+
+            # FIXME: 25/02/12 - This will break the simulation for some vibrational bands if J
+            #        exceeds 40 by too large of a margin.
+
+            a1: float = self.sim.predissociation["a1"][self.v_qn_up]
+            a2: float = self.sim.predissociation["a2"][self.v_qn_up]
+            a3: float = self.sim.predissociation["a3"][self.v_qn_up]
+            a4: float = self.sim.predissociation["a4"][self.v_qn_up]
+            a5: float = self.sim.predissociation["a5"][self.v_qn_up]
+            x: NDArray[np.int64] = self.j_qn_up * (self.j_qn_up + 1)
+
+            # Predissociation broadening in [1/cm].
+            return a1 + x * (a2 + x * (a3 + x * (a4 + x * a5)))
+
+        return np.zeros_like(self.wavenumbers)
+
+    def fwhm_natural(self, is_selected: bool) -> float:
+        """Return the natural broadening FWHM in [1/cm].
+
+        The natural FWHM linewidths are computed using Equation 8.11 in the 2016 book
+        "Spectroscopy and Optical Diagnostics for Gases" by Ronald K. Hanson et al. The linewidth is
+        the same for every line in the band.
+
+        Args:
+            is_selected (bool): True if natural broadening should be simulated.
+
+        Returns:
+            float: The natural broadening FWHM in [1/cm].
+        """
+        if is_selected:
+            # TODO: 24/10/21 - Look over this, seems weird still.
+
+            # The sum of the Einstein A coefficients for all downward transitions from the two
+            # levels of the transitions i and j.
+            i: int = self.v_qn_up
+            a_ik: float = self.sim.einstein[i, :i].sum()
+
+            j: int = self.v_qn_lo
+            a_jk: float = self.sim.einstein[j, :j].sum()
+
+            # Natural broadening in [1/cm].
+            return ((a_ik + a_jk) / (2 * math.pi)) / constants.LIGHT
+
+        return 0.0
+
+    def fwhm_collisional(self, is_selected: bool) -> float:
+        """Return the collisional broadening FWHM in [1/cm].
+
+        The collisional FWHM linewidths are computed using Equation 8.18 in the 2016 book
+        "Spectroscopy and Optical Diagnostics for Gases" by Ronald K. Hanson et al. The linewidth is
+        the same for every line in the band.
+
+        Args:
+            is_selected (bool): True if collisional broadening should be simulated.
+
+        Returns:
+            float: The collisional broadening FWHM in [1/cm].
+        """
+        if is_selected:
+            # NOTE: 24/11/05 - In most cases, the amount of electronically excited molecules in the
+            #       gas is essentially zero, meaning that most molecules are in the ground state.
+            #       Therefore, the ground state radius is used to compute the cross-section. An even
+            #       more accurate approach would be to multiply the radius in each state by its
+            #       Boltzmann fraction and add them together.
+            cross_section: float = (
+                math.pi
+                * (
+                    2
+                    * constants.INTERNUCLEAR_DISTANCE[self.sim.molecule.name][
+                        self.sim.state_lo.name
+                    ]
+                )
+                ** 2
+            )
+
+            # NOTE: 24/10/22 - Both the cross-section and reduced mass refer to the interactions
+            #       between two molecules, not the two atoms that compose a molecule. For now, only
+            #       homogeneous gases are considered, so the diameter and masses of the two
+            #       molecules are identical. The internuclear distance is being used as the
+            #       effective radius of the molecule. For homogeneous gases, the reduced mass is
+            #       just half the molecular mass (remember, this is for molecule-molecule
+            #       interactions).
+            reduced_mass: float = self.sim.molecule.mass / 2
+
+            # NOTE: 24/11/05 - The translational tempearature is used for collisional and Doppler
+            #       broadening since both effects are direct consequences of the thermal velocity of
+            #       molecules.
+
+            # Collisional (pressure) broadening in [1/cm].
+            return (
+                self.sim.pressure
+                * cross_section
+                * math.sqrt(8 / (math.pi * reduced_mass * constants.BOLTZ * self.sim.temp_trn))
+                / math.pi
+            ) / constants.LIGHT
+
+        return 0.0
+
+    def fwhm_doppler(self, is_selected: bool) -> NDArray[np.float64]:
+        """Return the Doppler broadening FWHM of each line in [1/cm].
+
+        The doppler FWHM linewidths are computed using Equation 8.24 in the 2016 book "Spectroscopy
+        and Optical Diagnostics for Gases" by Ronald K. Hanson et al.
+
+        Args:
+            is_selected (bool): True if Doppler broadening should be simulated.
+
+        Returns:
+            NDArray[np.float64]: The Doppler broadening FWHM in [1/cm].
+        """
+        if is_selected:
+            # Doppler (thermal) broadening in [1/cm]. Note that the speed of light is converted from
+            # [cm/s] to [m/s] to ensure that the units work out correctly.
+            return self.wavenumbers * math.sqrt(
+                8
+                * constants.BOLTZ
+                * self.sim.temp_trn
+                * math.log(2)
+                / (self.sim.molecule.mass * (constants.LIGHT / 1e2) ** 2)
+            )
+
+        return np.zeros_like(self.wavenumbers)
+
+    def fwhm_instrument(self, is_selected: bool, inst_broadening_wl: float) -> NDArray[np.float64]:
+        """Return the instrument broadening FWHM of each line in [1/cm].
+
+        The instrument FWHM linewidths are given as inputs from the user in units of [nm], which are
+        then converted to units of [1/cm].
+
+        Args:
+            is_selected (bool): True if instrument broadening should be simulated.
+            inst_broadening_wl (float): Instrument broadening FWHM in [nm].
+
+        Returns:
+            NDArray[np.float64]: The instrument broadening FWHM in [1/cm].
+        """
+        if is_selected:
+            # NOTE: 25/02/12 - Instrument broadening is passed into this function with units [nm],
+            #       so we must convert it to [1/cm]. Note that the FWHM is a bandwidth, so we cannot
+            #       simply convert [nm] to [1/cm] in the normal sense - there must be a central
+            #       wavelength to expand about.
+            return utils.bandwidth_wavelen_to_wavenum(
+                utils.wavenum_to_wavelen(self.wavenumbers), inst_broadening_wl
+            )
+
+        return np.zeros_like(self.wavenumbers)
+
     def get_vib_boltz_frac(self) -> float:
         """Return the vibrational Boltzmann fraction N_v / N.
 
@@ -125,23 +400,11 @@ class Band:
         """
         match self.sim.sim_type:
             case SimType.EMISSION:
-                state = self.sim.state_up
                 v_qn = self.v_qn_up
             case SimType.ABSORPTION:
-                state = self.sim.state_lo
                 v_qn = self.v_qn_lo
 
-        # NOTE: 24/10/25 - Calculates the vibrational Boltzmann fraction with respect to the
-        #       zero-point vibrational energy to match the vibrational partition function.
-        return (
-            np.exp(
-                -(terms.vibrational_term(state, v_qn) - terms.vibrational_term(state, 0))
-                * constants.PLANC
-                * constants.LIGHT
-                / (constants.BOLTZ * self.sim.temp_vib)
-            )
-            / self.sim.vib_part
-        )
+        return float(self.sim.vib_boltz_fracs[v_qn])
 
     def get_band_origin(self) -> float:
         """Return the band origin in [1/cm].
@@ -151,8 +414,8 @@ class Band:
         """
         # Herzberg p. 168, eq. (IV, 24)
 
-        upper_state: dict[str, list[float]] = self.sim.state_up.constants
-        lower_state: dict[str, list[float]] = self.sim.state_lo.constants
+        upper_state: dict[str, NDArray[np.float64]] = self.sim.state_up.constants
+        lower_state: dict[str, NDArray[np.float64]] = self.sim.state_lo.constants
 
         # NOTE: 24/11/05 - In the Cheung paper, the electronic energy is defined differently than in
         #       Herzberg's book. The conversion specified by Cheung on p. 5 is
@@ -173,173 +436,56 @@ class Band:
             - (lower_state["G"][self.v_qn_lo] - lower_state["G"][0])
         )
 
-    def get_rot_partition_fn(self) -> float:
-        """Return the rotational partition function, Q_r.
+    def get_wavenumbers(self) -> NDArray[np.float64]:
+        """Return the wavenumber of each line in [1/cm].
 
         Returns:
-            float: The rotational partition function, Q_r.
+            NDArray[np.float64]: The wavenumbers of the rotational lines in [1/cm].
         """
-        # TODO: 24/10/25 - Add nuclear effects to make this the effective rotational partition
-        #       function.
-
-        match self.sim.sim_type:
-            case SimType.EMISSION:
-                state = self.sim.state_up
-                v_qn = self.v_qn_up
-            case SimType.ABSORPTION:
-                state = self.sim.state_lo
-                v_qn = self.v_qn_lo
-
-        q_r: float = 0.0
-
-        # NOTE: 24/10/22 - The rotational partition function is always computed using the same
-        #       number of lines. At reasonable temperatures (~300 K), only around 50 rotational
-        #       lines contribute to the state sum. However, at high temperatures (~3000 K), at least
-        #       100 lines need to be considered to obtain an accurate estimate of the state sum.
-        #       This approach is used to ensure the sum is calculated correctly regardless of the
-        #       number of rotational lines simulated by the user.
-        for j_qn in range(201):
-            # TODO: 24/10/22 - Not sure which branch index should be used here. The triplet energies
-            #       are all close together, so it shouldn't matter too much. Averaging could work,
-            #       but I'm not sure if this is necessary.
-            q_r += (2 * j_qn + 1) * np.exp(
-                -terms.rotational_term(state, v_qn, j_qn, 2)
-                * constants.PLANC
-                * constants.LIGHT
-                / (constants.BOLTZ * self.sim.temp_rot)
-            )
-
-        # NOTE: 24/10/22 - Alternatively, the high-temperature approximation can be used instead of
-        #       the direct sum approach. This also works well.
+        # NOTE: 24/10/18 - Make sure to understand transition structure: Herzberg pp. 149-152, and
+        #       pp. 168-169.
 
-        # q_r = (
-        #     constants.BOLTZ
-        #     * self.sim.temp_rot
-        #     / (constants.PLANC * constants.LIGHT * state.constants["B"][v_qn])
-        # )
-
-        # The state sum must be divided by the symmetry parameter to account for identical
-        # rotational orientations in space.
-        return q_r / self.sim.molecule.symmetry_param
+        # Herzberg p. 168, eq. (IV, 24)
+        return self.band_origin + self.rot_terms_up - self.rot_terms_lo
 
-    def get_lines(self) -> list[Line]:
-        """Return a list of all allowed rotational lines.
+    def get_intensities(self) -> NDArray[np.float64]:
+        """Return the intensity of each line.
 
         Returns:
-            list[Line]: A list of all allowed `Line` objects for the given selection rules.
+            NDArray[np.float64]: The intensities of the rotational lines.
         """
-        lines: list[Line] = []
+        # NOTE: 24/10/18 - Before going any further make sure to read Herzberg pp. 20-21,
+        #       pp. 126-127, pp. 200-201, and pp. 382-383.
 
-        for n_qn_up in self.sim.rot_lvls:
-            for n_qn_lo in self.sim.rot_lvls:
-                # Ensure the rotational selection rules corresponding to each electronic state are
-                # properly followed.
-                if self.sim.state_up.is_allowed(n_qn_up) & self.sim.state_lo.is_allowed(n_qn_lo):
-                    lines.extend(self.allowed_branches(n_qn_up, n_qn_lo))
-
-        return lines
-
-    def allowed_branches(self, n_qn_up: int, n_qn_lo: int) -> list[Line]:
-        """Determine the selection rules for Hund's case (b).
+        match self.sim.sim_type:
+            case SimType.EMISSION:
+                j_qn = self.j_qn_up
+                wavenumber_factor = self.wavenumbers**4
+            case SimType.ABSORPTION:
+                j_qn = self.j_qn_lo
+                wavenumber_factor = self.wavenumbers
 
-        Args:
-            n_qn_up (int): Upper state rotational quantum number N'.
-            n_qn_lo (int): Lower state rotational quantum number N''.
+        # The factors shared by every line in the band are combined into a single scalar so that
+        # the line arrays are only scaled once, in place.
+        scale: float = self.vib_boltz_frac * self.sim.elc_boltz_frac * self.franck_condon
 
-        Raises:
-            ValueError: If the spin multiplicity of the two electronic states do not match.
+        intensities: NDArray[np.float64] = wavenumber_factor * self.rot_boltz_fracs
+        intensities *= self.honl_london_factors
+        intensities /= 2 * j_qn + 1
+        intensities *= scale
 
-        Returns:
-            list[Line]: A list of `Line` objects for all allowed branches.
-        """
-        # For Σ-Σ transitions, the rotational selection rules are ∆N = ±1, ∆N ≠ 0.
-        # Herzberg p. 244, eq. (V, 44)
-
-        lines: list[Line] = []
-
-        # Determine how many lines should be present in the fine structure of the molecule due to
-        # the effects of spin multiplicity.
-        if self.sim.state_up.spin_multiplicity == self.sim.state_lo.spin_multiplicity:
-            branch_range: range = range(1, self.sim.state_up.spin_multiplicity + 1)
-        else:
-            raise ValueError("Spin multiplicity of the two electronic states do not match.")
-
-        delta_n_qn: int = n_qn_up - n_qn_lo
-
-        # R branch
-        if delta_n_qn == 1:
-            lines.extend(self.branch_index(n_qn_up, n_qn_lo, branch_range, "R"))
-        # Q branch
-        if delta_n_qn == 0:
-            # Note that the Q branch doesn't exist for the Schumann-Runge bands of O2.
-            lines.extend(self.branch_index(n_qn_up, n_qn_lo, branch_range, "Q"))
-        # P branch
-        elif delta_n_qn == -1:
-            lines.extend(self.branch_index(n_qn_up, n_qn_lo, branch_range, "P"))
-
-        return lines
-
-    def branch_index(
-        self, n_qn_up: int, n_qn_lo: int, branch_range: range, branch_name: str
-    ) -> list[Line]:
-        """Return the rotational lines within a given branch.
+        return intensities
 
-        Args:
-            n_qn_up (int): Upper state rotational quantum number N'.
-            n_qn_lo (int): Lower state rotational quantum number N''.
-            branch_range (range): Range of branches corresponding to the spin multiplicity.
-            branch_name (str): The name of the branch, e.g. R, Q, or P.
+    def get_rot_boltz_fracs(self) -> NDArray[np.float64]:
+        """Return the rotational Boltzmann fraction, N_J / N, of each line.
 
         Returns:
-            list[Line]: A list of `Line` objects within a given branch.
+            NDArray[np.float64]: The rotational Boltzmann fractions, N_J / N.
         """
+        match self.sim.sim_type:
+            case SimType.EMISSION:
+                v_qn = self.v_qn_up
+            case SimType.ABSORPTION:
+                v_qn = self.v_qn_lo
 
-        def add_line(branch_idx_up: int, branch_idx_lo: int, is_satellite: bool) -> None:
-            """Create and append a rotational line."""
-            lines.append(
-                Line(
-                    sim=self.sim,
-                    band=self,
-                    n_qn_up=n_qn_up,
-                    n_qn_lo=n_qn_lo,
-                    j_qn_up=utils.n_to_j(n_qn_up, branch_idx_up),
-                    j_qn_lo=utils.n_to_j(n_qn_lo, branch_idx_lo),
-                    branch_idx_up=branch_idx_up,
-                    branch_idx_lo=branch_idx_lo,
-                    branch_name=branch_name,
-                    is_satellite=is_satellite,
-                )
-            )
-
-        # Herzberg pp. 249-251, eqs. (V, 48-53)
-
-        # NOTE: 24/10/16 - Every transition has 6 total lines (3 main + 3 satellite) except for the
-        #       N' = 0 to N'' = 1 transition, which has 3 total lines (1 main + 2 satellite).
-
-        lines: list[Line] = []
-
-        # Handle the special case where N' = 0 (only the P1, PQ12, and PQ13 lines exist).
-        if n_qn_up == 0:
-            if branch_name == "P":
-                add_line(1, 1, False)
-            for branch_idx_lo in (2, 3):
-                add_line(1, branch_idx_lo, True)
-
-            return lines
-
-        # Handle regular cases for other N'.
-        for branch_idx_up in branch_range:
-            for branch_idx_lo in branch_range:
-                # Main branches: R1, R2, R3, P1, P2, P3
-                if branch_idx_up == branch_idx_lo:
-                    add_line(branch_idx_up, branch_idx_lo, False)
-                # Satellite branches: RQ31, RQ32, RQ21
-                elif (
-                    (branch_name == "R")
-                    and (branch_idx_up > branch_idx_lo)
-                    or (branch_name == "P")
-                    and (branch_idx_up < branch_idx_lo)
-                ):
-                    add_line(branch_idx_up, branch_idx_lo, True)
-
-        return lines
+        return self.sim.rot_boltz_fracs(v_qn)
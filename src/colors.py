@@ -19,6 +19,7 @@
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib import color_sequences
 from matplotlib.colors import Colormap, to_hex
 
@@ -54,6 +55,7 @@ def get_colors(bands: list[tuple[int, int]]) -> list[str]:
         return colors_medium[:num_bands]
 
     cmap: Colormap = plt.get_cmap("rainbow")
-    colors_large: list[str] = [to_hex(cmap(i / num_bands)) for i in range(num_bands)]
+    # The colormap is sampled for every band in a single call rather than once per band.
+    colors_large: list[str] = [to_hex(color) for color in cmap(np.arange(num_bands) / num_bands)]
 
     return colors_large
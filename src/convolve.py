@@ -16,69 +16,71 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
 import numpy as np
-from numpy.typing import NDArray
+from scipy import fft as sp_fft
 from scipy.special import wofz
 
-from line import Line
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from band import Band
+
+# Ratio between adjacent FWHMs on the logarithmic grid of kernel widths used for interpolation.
+FWHM_SPACING: float = 1.1
+
+# Precision of the FFTs used for convolution. The convolved spectra are only ever plotted or
+# exported, so single precision is more than enough as long as the intensities are scaled first.
+CONV_DTYPE: type[np.float32] = np.float32
+
+# Number of grid points on either side of each line over which its profile is evaluated exactly
+# instead of being approximated by the binned kernels.
+NEAR_POINTS: int = 16
 
 
 def broadening_fn(
     wavenumbers_conv: NDArray[np.float64],
-    line: Line,
-    fwhm_selections: dict[str, bool],
-    inst_broadening_wl: float,
+    wavenumber: float | NDArray[np.float64],
+    fwhm_gaussian: float | NDArray[np.float64],
+    fwhm_lorentzian: float | NDArray[np.float64],
 ) -> NDArray[np.float64]:
     """Return the contribution of a single rotational line to the total spectra.
 
-    Uses a Voigt probability density function.
+    Uses a Voigt probability density function. Arrays of line parameters are broadcast against the
+    wavenumbers, in which case every line must have the same type of profile.
 
     Args:
         wavenumbers_conv (NDArray[np.float64]): A continuous array of wavenumbers.
-        line (Line): A rotational `Line` object.
-        fwhm_selections (dict[str, bool]): The types of broadening to be simulated.
-        inst_broadening_wl (float): Instrument broadening FWHM in [nm].
+        wavenumber (float | NDArray[np.float64]): The wavenumber of the rotational line in [1/cm].
+        fwhm_gaussian (float | NDArray[np.float64]): The Gaussian FWHM of the rotational line in
+            [1/cm].
+        fwhm_lorentzian (float | NDArray[np.float64]): The Lorentzian FWHM of the rotational line in
+            [1/cm].
 
     Returns:
         NDArray[np.float64]: The Voigt probability density function for a single rotational line.
     """
-    # Instrument broadening in [1/cm] is added to thermal broadening to get the full Gaussian FWHM.
-    # Note that Gaussian FWHMs must be summed in quadrature: see "Hypersonic Nonequilibrium Flows:
-    # Fundamentals and Recent Advances" p. 361.
-    fwhm_gaussian: float = np.sqrt(
-        line.fwhm_instrument(fwhm_selections["instrument"], inst_broadening_wl) ** 2
-        + line.fwhm_doppler(fwhm_selections["doppler"]) ** 2
-    )
-
-    # NOTE: 24/10/25 - Since predissociating repulsive states have no interfering absorption, the
-    #       broadened absorption lines will be Lorentzian in shape. See Julienne, 1975.
-
-    # Add the effects of natural, collisional, and predissociation broadening to get the full
-    # Lorentzian FWHM. Lorentzian FHWMs are summed linearly: see "Hypersonic Nonequilibrium Flows:
-    # Fundamentals and Recent Advances" p. 361.
-    fwhm_lorentzian: float = (
-        line.fwhm_natural(fwhm_selections["natural"])
-        + line.fwhm_collisional(fwhm_selections["collisional"])
-        + line.fwhm_predissociation(fwhm_selections["predissociation"])
-    )
-
     # NOTE: 25/04/25 - The forms of the Gaussian and Lorentzian PDFs used here are written in terms
     #       of the FWHM. More commonly, the Gaussian PDF is written in terms of σ, the standard
     #       deviation, and the Lorentzian is written in terms of γ, the half-width at half-maximum.
 
     # If only Gaussian FWHM parameters are present, then return a Gaussian profile.
-    if (fwhm_gaussian > 0.0) and (fwhm_lorentzian == 0.0):
+    if np.all(fwhm_gaussian > 0.0) and np.all(fwhm_lorentzian == 0.0):
         return (
             (2 / fwhm_gaussian)
-            * np.sqrt(np.log(2) / np.pi)
-            * np.exp(-4 * np.log(2) * ((wavenumbers_conv - line.wavenumber) / fwhm_gaussian) ** 2)
+            * math.sqrt(math.log(2) / math.pi)
+            * np.exp(-4 * math.log(2) * ((wavenumbers_conv - wavenumber) / fwhm_gaussian) ** 2)
         )
 
     # Similarly, if only Lorentzian FWHM parameters exist, then return a Lorentzian profile.
-    if (fwhm_gaussian == 0.0) and (fwhm_lorentzian > 0.0):
+    if np.all(fwhm_gaussian == 0.0) and np.all(fwhm_lorentzian > 0.0):
         return np.divide(
             fwhm_lorentzian,
-            (2 * np.pi * ((wavenumbers_conv - line.wavenumber) ** 2 + (fwhm_lorentzian / 2) ** 2)),
+            (2 * math.pi * ((wavenumbers_conv - wavenumber) ** 2 + (fwhm_lorentzian / 2) ** 2)),
         )
 
     # TODO: 25/02/14 - Should check if both Gaussian and Lorentzian FWHM params are zero here and
@@ -86,30 +88,33 @@ def broadening_fn(
 
     # The FWHM of the Gaussian PDF is 2 * sigma * sqrt(2 * ln(2)), where sigma is the standard
     # deviation.
-    gaussian_stddev: float = fwhm_gaussian / (2 * np.sqrt(2 * np.log(2)))
+    gaussian_stddev: float = fwhm_gaussian / (2 * math.sqrt(2 * math.log(2)))
 
     # The FWHM of the Lorentzian PDF is 2 * gamma, where gamma is the half-width at half-maximum.
     lorentzian_hwhm: float = fwhm_lorentzian / 2
 
     # Otherwise, compute the argument of the complex Faddeeva function and return a Voigt profile.
-    z: NDArray[np.float64] = ((wavenumbers_conv - line.wavenumber) + 1j * lorentzian_hwhm) / (
-        gaussian_stddev * np.sqrt(2)
+    z: NDArray[np.float64] = ((wavenumbers_conv - wavenumber) + 1j * lorentzian_hwhm) / (
+        gaussian_stddev * math.sqrt(2)
     )
 
     # The probability density function for the Voigt profile.
-    return np.real(wofz(z)) / (gaussian_stddev * np.sqrt(2 * np.pi))
+    return np.real(wofz(z)) / (gaussian_stddev * math.sqrt(2 * math.pi))
 
 
 def convolve(
-    lines: list[Line],
+    band: Band,
     wavenumbers_conv: NDArray[np.float64],
     fwhm_selections: dict[str, bool],
     inst_broadening_wl: float,
 ) -> NDArray[np.float64]:
     """Convolve a discrete number of spectral lines into a continuous spectra.
 
+    Instrument broadening is included in the Gaussian FWHM of every line, evaluated at the
+    wavenumber of that line.
+
     Args:
-        lines (list[Line]): A list of rotational `Line` objects.
+        band (Band): The vibrational band containing the rotational lines.
         wavenumbers_conv (NDArray[np.float64]): A continuous array of wavenumbers.
         fwhm_selections (dict[str, bool]): The types of broadening to be simulated.
         inst_broadening_wl (float): Instrument broadening FWHM in [nm].
@@ -117,16 +122,265 @@ def convolve(
     Returns:
         NDArray[np.float64]: The total intensity spectrum with contributions from all lines.
     """
-    intensities_conv: NDArray[np.float64] = np.zeros_like(wavenumbers_conv)
+    # Instrument broadening in [1/cm] is added to thermal broadening to get the full Gaussian FWHM.
+    # Note that Gaussian FWHMs must be summed in quadrature: see "Hypersonic Nonequilibrium Flows:
+    # Fundamentals and Recent Advances" p. 361.
+    fwhm_gaussian: NDArray[np.float64] = np.sqrt(
+        band.fwhm_instrument(fwhm_selections["instrument"], inst_broadening_wl) ** 2
+        + band.fwhm_doppler(fwhm_selections["doppler"]) ** 2
+    )
+
+    # NOTE: 24/10/25 - Since predissociating repulsive states have no interfering absorption, the
+    #       broadened absorption lines will be Lorentzian in shape. See Julienne, 1975.
+
+    # Add the effects of natural, collisional, and predissociation broadening to get the full
+    # Lorentzian FWHM. Lorentzian FHWMs are summed linearly: see "Hypersonic Nonequilibrium Flows:
+    # Fundamentals and Recent Advances" p. 361.
+    fwhm_lorentzian: NDArray[np.float64] = (
+        band.fwhm_natural(fwhm_selections["natural"])
+        + band.fwhm_collisional(fwhm_selections["collisional"])
+        + band.fwhm_predissociation(fwhm_selections["predissociation"])
+    )
+
+    # Evaluating a separate broadening function for every line over the entire grid scales as
+    # O(lines * points). Instead, the lines are binned onto the (uniform) grid and convolved with a
+    # small set of fixed-width kernels using FFTs. Since the widths vary from line to line, each
+    # line is split between the kernels on a logarithmic width grid that bracket its true Gaussian
+    # and Lorentzian FWHMs, weighted by linear interpolation.
+
+    # Binning smears each line over the two nearest grid points, which badly distorts lines that
+    # are only a few grid points wide (the peaks of collisionally broadened lines at the default
+    # granularity were less than half of their true height). The binned approximation is therefore
+    # only used for the wings. Within NEAR_POINTS of each line, the approximation is swapped out for
+    # the profile evaluated exactly at the position of the line.
 
-    # TODO: 25/02/12 - See if switching to scipy's convolve method improves the speed of this,
-    #       especially with a large number of bands or points.
+    num_points: int = wavenumbers_conv.size
+    step: float = wavenumbers_conv[1] - wavenumbers_conv[0]
 
-    # Add the effects of each line to the continuous spectra by computing its broadening function
-    # multiplied by its intensity and adding it to the total intensity.
-    for line in lines:
-        intensities_conv += line.intensity * broadening_fn(
-            wavenumbers_conv, line, fwhm_selections, inst_broadening_wl
+    # Offsets spanning the entire grid so that the far wings of each line are retained when the
+    # "same" portion of the convolution is taken. Every kernel is symmetric, so it is only evaluated
+    # at the non-negative offsets and then mirrored to cover the entire grid in both directions.
+    offsets: NDArray[np.float32] = np.arange(num_points, dtype=CONV_DTYPE) * CONV_DTYPE(step)
+
+    # Fractional position of each line on the grid. Each line is shared between the two nearest
+    # grid points such that its integrated intensity and centroid are preserved.
+    position: NDArray[np.float64] = (band.wavenumbers - wavenumbers_conv[0]) / step
+    point_lo: NDArray[np.int64] = np.clip(np.floor(position).astype(np.int64), 0, num_points - 2)
+    weight_point: NDArray[np.float64] = np.clip(position - point_lo, 0.0, 1.0)
+
+    node_gaussian, weight_gaussian, widths_gaussian = width_nodes(fwhm_gaussian)
+    node_lorentzian, weight_lorentzian, widths_lorentzian = width_nodes(fwhm_lorentzian)
+
+    # Every line contributes to four kernels: the lower and upper nodes of both the Gaussian and
+    # Lorentzian width grids. One row is filled for each combination of nodes.
+    node_all: NDArray[np.int64] = np.empty((4, band.wavenumbers.size), dtype=np.int64)
+    weight_all: NDArray[np.float64] = np.empty((4, band.wavenumbers.size))
+
+    for row, (shift_g, shift_l) in enumerate(((0, 0), (0, 1), (1, 0), (1, 1))):
+        factor_g: NDArray[np.float64] = weight_gaussian if shift_g else 1.0 - weight_gaussian
+        factor_l: NDArray[np.float64] = weight_lorentzian if shift_l else 1.0 - weight_lorentzian
+
+        node_all[row] = (
+            (node_gaussian + shift_g) * widths_lorentzian.size + node_lorentzian + shift_l
         )
+        np.multiply(band.intensities, factor_g * factor_l, out=weight_all[row])
+
+    # Absolute intensities can be far smaller than the smallest single-precision number (emission
+    # from an unpopulated upper state can be ~1e-90), so the lines are scaled relative to the
+    # strongest line of the band before being binned and rescaled once the convolution is done.
+    scale: float = float(band.intensities.max()) or 1.0
+
+    node_all = node_all.ravel()
+    weight_all = weight_all.ravel() / scale
+    point_all: NDArray[np.int64] = np.tile(point_lo, 4)
+    frac_all: NDArray[np.float64] = np.tile(weight_point, 4)
+
+    # Length of the full linear convolution between the binned lines and a kernel, padded to a size
+    # that the FFT handles efficiently. Since convolution is linear, the products of the transforms
+    # for every kernel are summed and only a single inverse transform is needed.
+    num_full: int = 3 * num_points - 2
+    num_fft: int = sp_fft.next_fast_len(num_full, real=True)
+    spectrum: NDArray[np.complex64] = np.zeros(num_fft // 2 + 1, dtype=np.complex64)
+
+    # Lines without any broadening are left as discrete spikes with the correct area. They are
+    # placed at the center of the kernel so that they line up with the broadened lines.
+    kernel_spike: NDArray[np.float32] = np.zeros(2 * num_points - 1, dtype=CONV_DTYPE)
+    kernel_spike[num_points - 1] = 1.0 / step
+
+    # The value of every kernel at the offsets closest to the center, which is the part of the
+    # binned approximation that is replaced by the exact profiles.
+    kernels_near: NDArray[np.float32] = np.zeros(
+        (widths_gaussian.size * widths_lorentzian.size, NEAR_POINTS + 2), dtype=CONV_DTYPE
+    )
+
+    for node in np.unique(node_all[weight_all != 0.0]):
+        mask: NDArray[np.bool_] = node_all == node
+
+        binned: NDArray[np.float32] = (
+            np.bincount(
+                point_all[mask],
+                weights=weight_all[mask] * (1.0 - frac_all[mask]),
+                minlength=num_points,
+            )
+            + np.bincount(
+                point_all[mask] + 1, weights=weight_all[mask] * frac_all[mask], minlength=num_points
+            )
+        ).astype(CONV_DTYPE)
+
+        # The widths are passed as Python floats so that the kernel keeps the precision of the
+        # offsets instead of being promoted back to double precision.
+        width_gaussian: float = float(widths_gaussian[node // widths_lorentzian.size])
+        width_lorentzian: float = float(widths_lorentzian[node % widths_lorentzian.size])
+
+        if (width_gaussian == 0.0) and (width_lorentzian == 0.0):
+            kernel: NDArray[np.float32] = kernel_spike
+        else:
+            kernel_half: NDArray[np.float32] = broadening_fn(
+                offsets, 0.0, width_gaussian, width_lorentzian
+            )
+            kernel = np.concatenate((kernel_half[:0:-1], kernel_half))
+            kernels_near[node] = kernel_half[: NEAR_POINTS + 2]
+
+        spectrum += sp_fft.rfft(binned, num_fft) * sp_fft.rfft(kernel, num_fft)
+
+    # The exact profiles are only defined for lines with some amount of broadening, so lines
+    # without any are left as spikes.
+    is_broadened: NDArray[np.bool_] = (fwhm_gaussian > 0.0) | (fwhm_lorentzian > 0.0)
+
+    # Grid points on both sides of the two points that each line is split between.
+    points: NDArray[np.int64] = point_lo[is_broadened, None] + np.arange(
+        -NEAR_POINTS, NEAR_POINTS + 2
+    )
+    is_inside: NDArray[np.bool_] = (points >= 0) & (points < num_points)
+
+    binned_near: NDArray[np.float64] = binned_profiles(
+        kernels_near,
+        node_all.reshape(4, -1)[:, is_broadened],
+        weight_all.reshape(4, -1)[:, is_broadened],
+        weight_point[is_broadened],
+    )
+
+    exact_near: NDArray[np.float64] = line_profiles(
+        np.take(wavenumbers_conv, points, mode="clip") - band.wavenumbers[is_broadened, None],
+        fwhm_gaussian[is_broadened],
+        fwhm_lorentzian[is_broadened],
+    )
+    exact_near *= band.intensities[is_broadened, None] / scale
+
+    # The correction is aligned with the grid portion of the full convolution and transformed
+    # alongside the binned lines.
+    near_full: NDArray[np.float32] = np.zeros(num_fft, dtype=CONV_DTYPE)
+    near_full[num_points - 1 : 2 * num_points - 1] = np.bincount(
+        points[is_inside],
+        weights=(exact_near - binned_near)[is_inside],
+        minlength=num_points,
+    )
+    spectrum += sp_fft.rfft(near_full)
+
+    # Only the portion of the full convolution aligned with the original grid is kept.
+    intensities_conv: NDArray[np.float64] = np.multiply(
+        sp_fft.irfft(spectrum, num_fft)[num_points - 1 : 2 * num_points - 1],
+        scale,
+        dtype=np.float64,
+    )
 
     return intensities_conv
+
+
+def binned_profiles(
+    kernels_near: NDArray[np.float32],
+    node_all: NDArray[np.int64],
+    weight_all: NDArray[np.float64],
+    weight_point: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Return the binned approximation of each line at the grid points nearest to it.
+
+    Args:
+        kernels_near (NDArray[np.float32]): The value of every kernel at the offsets nearest to its
+            center.
+        node_all (NDArray[np.int64]): The four kernel nodes of each line, one row per node.
+        weight_all (NDArray[np.float64]): The weight given to each of the four kernel nodes.
+        weight_point (NDArray[np.float64]): The weight given to the grid point above each line.
+
+    Returns:
+        NDArray[np.float64]: The binned approximation of each line at NEAR_POINTS on either side of
+            the two grid points that it is split between, one row per line.
+    """
+    shifts: NDArray[np.int64] = np.arange(-NEAR_POINTS, NEAR_POINTS + 2)
+    frac: NDArray[np.float64] = weight_point[None, :, None]
+    kernels_line: NDArray[np.float32] = kernels_near[node_all]
+
+    # The kernel of each node is centered on both grid points and weighted by the fractional
+    # position of the line between them.
+    return np.einsum(
+        "nl,nlp->lp",
+        weight_all,
+        (1.0 - frac) * kernels_line[..., np.abs(shifts)]
+        + frac * kernels_line[..., np.abs(shifts - 1)],
+    )
+
+
+def line_profiles(
+    offsets: NDArray[np.float64],
+    fwhm_gaussian: NDArray[np.float64],
+    fwhm_lorentzian: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Return the profile of each line evaluated at a set of offsets from its center.
+
+    Args:
+        offsets (NDArray[np.float64]): Offsets from the center of each line in [1/cm], one row per
+            line.
+        fwhm_gaussian (NDArray[np.float64]): The Gaussian FWHM of each line in [1/cm].
+        fwhm_lorentzian (NDArray[np.float64]): The Lorentzian FWHM of each line in [1/cm].
+
+    Returns:
+        NDArray[np.float64]: The Voigt probability density function of each line, one row per line.
+    """
+    profiles: NDArray[np.float64] = np.zeros_like(offsets)
+
+    # Lines are grouped by the type of their profile so that each group is evaluated in one call.
+    # Lines without any broadening are left as zeros.
+    for has_gaussian, has_lorentzian in ((True, False), (False, True), (True, True)):
+        group: NDArray[np.bool_] = ((fwhm_gaussian > 0.0) == has_gaussian) & (
+            (fwhm_lorentzian > 0.0) == has_lorentzian
+        )
+
+        if group.any():
+            profiles[group] = broadening_fn(
+                offsets[group], 0.0, fwhm_gaussian[group, None], fwhm_lorentzian[group, None]
+            )
+
+    return profiles
+
+
+def width_nodes(
+    fwhm: NDArray[np.float64],
+) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]:
+    """Return the interpolation nodes and weights of each line on a logarithmic grid of widths.
+
+    Args:
+        fwhm (NDArray[np.float64]): The FWHM of each line in [1/cm].
+
+    Returns:
+        tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]: The index of the lower
+            bracketing node for each line, the weight given to the upper node, and the FWHM of
+            every node. Lines with zero width map onto a node of zero width.
+    """
+    positive: NDArray[np.bool_] = fwhm > 0.0
+
+    if not positive.any():
+        return np.zeros(fwhm.size, dtype=np.int64), np.zeros_like(fwhm), np.zeros(2)
+
+    fwhm_min: float = fwhm[positive].min()
+
+    # Position of each line on the logarithmic grid, with the first node reserved for zero width.
+    position: NDArray[np.float64] = np.zeros_like(fwhm)
+    position[positive] = 1.0 + np.log(fwhm[positive] / fwhm_min) / math.log(FWHM_SPACING)
+
+    node: NDArray[np.int64] = np.floor(position).astype(np.int64)
+    weight: NDArray[np.float64] = position - node
+
+    widths: NDArray[np.float64] = np.zeros(node.max() + 2)
+    widths[1:] = fwhm_min * FWHM_SPACING ** np.arange(node.max() + 1)
+
+    return node, weight, widths
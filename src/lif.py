@@ -16,7 +16,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from typing import overload
 
 import matplotlib.pyplot as plt
@@ -25,19 +26,26 @@ import scipy as sy
 from numpy.typing import NDArray
 
 import constants
-import utils
 from atom import Atom
 from line import Line
 from molecule import Molecule
-from sim import Sim
+from sim import Sim, load_table
 from simtype import SimType
 from state import State
 
 MIN_TIME: float = 0.0
 MAX_TIME: float = 60e-9
 N_TIME: int = 1000
+# Fluence scans only use the integrated signal of each solve, which is converged to within ~1e-5 of
+# the full time resolution at this number of points.
+N_TIME_SCAN: int = 200
 N_FLUENCE: int = 100
 
+# Constants of the Gaussian laser pulse, which is normalized such that its integral over time is
+# equal to the fluence.
+FOUR_LN2: float = 4.0 * math.log(2.0)
+GAUSSIAN_NORM: float = math.sqrt(FOUR_LN2 / math.pi)
+
 
 @dataclass
 class RateParams:
@@ -69,12 +77,24 @@ class LaserParams:
     Attributes:
         pulse_center (float): Center of the laser pulse in [s].
         pulse_width (float): Width of the laser pulse in [s].
-        fluence (float): Laser energy per unit area in [J/cm^2].
+        fluence (float | NDArray[np.float64]): Laser energy per unit area in [J/cm^2]. An array of
+            fluences describes one pulse for each system in a stacked set of rate equations.
+        peak_intensity (float | NDArray[np.float64]): Intensity at the center of the laser pulse
+            in [W/cm^2].
+        exponent_scale (float): Coefficient of the squared time offset in the Gaussian exponent
+            in [1/s^2].
     """
 
     pulse_center: float
     pulse_width: float
-    fluence: float
+    fluence: float | NDArray[np.float64]
+    peak_intensity: float | NDArray[np.float64] = field(init=False)
+    exponent_scale: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Compute the constant factors of the pulse shape once instead of at every time step."""
+        self.peak_intensity = self.fluence / self.pulse_width * GAUSSIAN_NORM
+        self.exponent_scale = FOUR_LN2 / self.pulse_width**2
 
 
 @overload
@@ -101,12 +121,43 @@ def laser_intensity(
     Returns:
         float | NDArray[np.float64]: Laser intensity at the specified time point(s).
     """
-    return (
-        laser_params.fluence
-        / laser_params.pulse_width
-        * np.sqrt(4 * np.log(2) / np.pi)
-        * np.exp(-4 * np.log(2) * ((t - laser_params.pulse_center) / laser_params.pulse_width) ** 2)
-    )
+    dt: float | NDArray[np.float64] = t - laser_params.pulse_center
+
+    # The ODE solver evaluates the intensity one time point at a time, where the `math` module is
+    # much faster than NumPy's scalar ufuncs.
+    if isinstance(dt, float):
+        return laser_params.peak_intensity * math.exp(-laser_params.exponent_scale * dt * dt)
+
+    # For arrays, every step is done in place in the array of time offsets to avoid temporaries.
+    dt *= dt
+    dt *= -laser_params.exponent_scale
+    np.exp(dt, out=dt)
+    dt *= laser_params.peak_intensity
+
+    return dt
+
+
+def pumping_rates(
+    t: float, rate_params: RateParams, laser_params: LaserParams
+) -> tuple[float, float]:
+    """Return the laser-induced absorption and stimulated emission rates.
+
+    Args:
+        t (float): Current time in [s].
+        rate_params (RateParams): Rate parameters and Einstein coefficients for the system.
+        laser_params (LaserParams): Laser parameters.
+
+    Returns:
+        tuple[float, float]: The absorption rate W_la and stimulated emission rate W_le in [1/s].
+    """
+    # TODO: 24/10/29 - Implement the overlap integral between the transition and laser lineshapes.
+    overlap_integral: float = 1.5  # [cm]
+
+    i_l: float = laser_intensity(t, laser_params)
+    w_la: float = i_l * rate_params.b_12 * overlap_integral / constants.LIGHT
+    w_le: float = i_l * rate_params.b_21 * overlap_integral / constants.LIGHT
+
+    return w_la, w_le
 
 
 def rate_equations(
@@ -130,14 +181,9 @@ def rate_equations(
     """
     n1, n2, n3 = n
 
-    # TODO: 24/10/29 - Implement the overlap integral between the transition and laser lineshapes.
-    overlap_integral: float = 1.5  # [cm]
-
     f_b: float = line.rot_boltz_frac
 
-    i_l: float = laser_intensity(t, laser_params)
-    w_la: float = i_l * rate_params.b_12 * overlap_integral / constants.LIGHT
-    w_le: float = i_l * rate_params.b_21 * overlap_integral / constants.LIGHT
+    w_la, w_le = pumping_rates(t, rate_params, laser_params)
 
     dn1_dt: float = -w_la * n1 + n2 * (w_le + rate_params.a_21) + rate_params.w_c * (n3 - n1)
     dn2_dt: float = w_la * n1 - n2 * (
@@ -148,6 +194,47 @@ def rate_equations(
     return [dn1_dt, dn2_dt, dn3_dt]
 
 
+def rate_jacobian(
+    _: list[float],
+    t: float,
+    rate_params: RateParams,
+    laser_params: LaserParams,
+    line: Line,
+) -> NDArray[np.float64]:
+    """Return the Jacobian of the rate equations with respect to the population densities.
+
+    The system is linear in N1, N2, and N3, so the Jacobian only depends on time through the laser
+    intensity. Supplying it analytically saves the solver from estimating it with finite
+    differences, which requires extra evaluations of the rate equations at every step.
+
+    Args:
+        _ (list[float]): Nondimensional population density of N1, N2, and N3 at a point in time.
+        t (float): Current time in [s].
+        rate_params (RateParams): Rate parameters and Einstein coefficients for the system.
+        laser_params (LaserParams): Laser parameters.
+        line (Line): The rotational `Line` object of interest.
+
+    Returns:
+        NDArray[np.float64]: The 3x3 matrix of partial derivatives d(dNi/dt)/dNj.
+    """
+    f_b: float = line.rot_boltz_frac
+    w_r: float = rate_params.w_c * f_b / (1 - f_b)
+
+    w_la, w_le = pumping_rates(t, rate_params, laser_params)
+
+    return np.array(
+        [
+            [-w_la - rate_params.w_c, w_le + rate_params.a_21, rate_params.w_c],
+            [
+                w_la,
+                -(w_le + rate_params.w_d + rate_params.a_21 + rate_params.w_f + rate_params.w_q),
+                0.0,
+            ],
+            [w_r, 0.0, -w_r],
+        ]
+    )
+
+
 def simulate(
     t: NDArray[np.float64], rate_params: RateParams, laser_params: LaserParams, line: Line
 ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
@@ -166,7 +253,7 @@ def simulate(
     n: list[float] = [1.0, 0.0, 1.0]
 
     solution: NDArray[np.float64] = sy.integrate.odeint(
-        rate_equations, n, t, args=(rate_params, laser_params, line)
+        rate_equations, n, t, args=(rate_params, laser_params, line), Dfun=rate_jacobian
     )
 
     n1: NDArray[np.float64] = solution[:, 0]
@@ -176,20 +263,157 @@ def simulate(
     return n1, n2, n3
 
 
+def stacked_rate_equations(
+    n: NDArray[np.float64],
+    t: float,
+    rate_params: RateParams,
+    laser_params: LaserParams,
+    line: Line,
+) -> NDArray[np.float64]:
+    """Return the rate equations for several laser fluences stacked into a single system.
+
+    Args:
+        n (NDArray[np.float64]): Population densities N1, N2, and N3 of each fluence in turn, with
+            shape (3 * laser_params.fluence.size,).
+        t (float): Current time in [s].
+        rate_params (RateParams): Rate parameters and Einstein coefficients for the system.
+        laser_params (LaserParams): Laser parameters with an array of fluences in [J/cm^2].
+        line (Line): The rotational `Line` object of interest.
+
+    Returns:
+        NDArray[np.float64]: Differential equations dN1/dt, dN2/dt, and dN3/dt for each fluence,
+            in the same order as the population densities.
+    """
+    n1: NDArray[np.float64] = n[0::3]
+    n2: NDArray[np.float64] = n[1::3]
+    n3: NDArray[np.float64] = n[2::3]
+
+    f_b: float = line.rot_boltz_frac
+
+    # The laser intensity, and therefore each pumping rate, has one value per fluence.
+    w_la, w_le = pumping_rates(t, rate_params, laser_params)
+
+    dn_dt: NDArray[np.float64] = np.empty_like(n)
+    dn_dt[0::3] = -w_la * n1 + n2 * (w_le + rate_params.a_21) + rate_params.w_c * (n3 - n1)
+    dn_dt[1::3] = w_la * n1 - n2 * (
+        w_le + rate_params.w_d + rate_params.a_21 + rate_params.w_f + rate_params.w_q
+    )
+    dn_dt[2::3] = -rate_params.w_c * f_b / (1 - f_b) * (n3 - n1)
+
+    return dn_dt
+
+
+def stacked_rate_jacobian(
+    _: NDArray[np.float64],
+    t: float,
+    rate_params: RateParams,
+    laser_params: LaserParams,
+    line: Line,
+) -> NDArray[np.float64]:
+    """Return the banded Jacobian of the stacked rate equations.
+
+    Each fluence only couples its own three population densities, so the Jacobian is block diagonal
+    with a bandwidth of two on either side of the diagonal. It is returned in the packed banded
+    form expected by `odeint`, where element (i, j) is stored at row i - j + 2 and column j.
+
+    Args:
+        _ (NDArray[np.float64]): Population densities N1, N2, and N3 of each fluence in turn.
+        t (float): Current time in [s].
+        rate_params (RateParams): Rate parameters and Einstein coefficients for the system.
+        laser_params (LaserParams): Laser parameters with an array of fluences in [J/cm^2].
+        line (Line): The rotational `Line` object of interest.
+
+    Returns:
+        NDArray[np.float64]: The nonzero partial derivatives d(dNi/dt)/dNj with shape
+            (5, 3 * laser_params.fluence.size).
+    """
+    f_b: float = line.rot_boltz_frac
+    w_r: float = rate_params.w_c * f_b / (1 - f_b)
+
+    w_la, w_le = pumping_rates(t, rate_params, laser_params)
+
+    jacobian: NDArray[np.float64] = np.zeros((5, 3 * w_la.size))
+    jacobian[2, 0::3] = -w_la - rate_params.w_c
+    jacobian[1, 1::3] = w_le + rate_params.a_21
+    jacobian[0, 2::3] = rate_params.w_c
+    jacobian[3, 0::3] = w_la
+    jacobian[2, 1::3] = -(
+        w_le + rate_params.w_d + rate_params.a_21 + rate_params.w_f + rate_params.w_q
+    )
+    jacobian[4, 0::3] = w_r
+    jacobian[2, 2::3] = -w_r
+
+    return jacobian
+
+
+def simulate_fluences(
+    t: NDArray[np.float64],
+    rate_params: RateParams,
+    laser_params: LaserParams,
+    line: Line,
+    fluences: NDArray[np.float64],
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Return the population densities of the three states for several laser fluences at once.
+
+    All fluences are integrated together as one stacked system, which costs the solver far fewer
+    calls than integrating each fluence on its own.
+
+    Args:
+        t (NDArray[np.float64]): The time domain to simulate over in [s].
+        rate_params (RateParams): Rate parameters and Einstein coefficients for the system.
+        laser_params (LaserParams): Laser parameters for a fluence of 1 J/cm^2, which set the shape
+            of the pulse.
+        line (Line): The rotational `Line` object of interest.
+        fluences (NDArray[np.float64]): Laser energies per unit area in [J/cm^2].
+
+    Returns:
+        tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]: The normalized
+            population densities N1, N2, and N3, each with shape (fluences.size, t.size).
+    """
+    # The same pulse is scaled to every fluence.
+    laser_params_stacked: LaserParams = LaserParams(
+        laser_params.pulse_center, laser_params.pulse_width, laser_params.fluence * fluences
+    )
+    n: NDArray[np.float64] = np.tile([1.0, 0.0, 1.0], fluences.size)
+
+    solution: NDArray[np.float64] = sy.integrate.odeint(
+        stacked_rate_equations,
+        n,
+        t,
+        args=(rate_params, laser_params_stacked, line),
+        Dfun=stacked_rate_jacobian,
+        ml=2,
+        mu=2,
+    )
+
+    n1: NDArray[np.float64] = solution[:, 0::3].T
+    n2: NDArray[np.float64] = solution[:, 1::3].T
+    n3: NDArray[np.float64] = solution[:, 2::3].T
+
+    return n1, n2, n3
+
+
 def get_signal(
     t: NDArray[np.float64], n2: NDArray[np.float64], rate_params: RateParams
 ) -> NDArray[np.float64]:
     """Return the LIF signal as a function of time.
 
     Args:
-        t (NDArray[np.float64]): The time domain to simulate over in [s].
+        t (NDArray[np.float64]): The time domain to simulate over in [s], which must be uniformly
+            spaced.
         n2 (NDArray[np.float64]): Normalized population density of state 2.
         rate_params (RateParams): Rate parameters and Einstein coefficients for the system.
 
     Returns:
         NDArray[np.float64]: The total integrated LIF signal from state 2 as a function of time.
     """
-    return rate_params.w_f * sy.integrate.cumulative_trapezoid(n2, t, initial=0)
+    # On a uniform grid, the cumulative trapezoidal integral (starting from zero) reduces to a
+    # running sum with half of the first and current samples removed.
+    signal: NDArray[np.float64] = np.cumsum(n2)
+    signal -= 0.5 * (n2 + n2[0])
+    signal *= rate_params.w_f * (t[1] - t[0])
+
+    return signal
 
 
 def get_sim(
@@ -247,14 +471,10 @@ def get_line(sim: Sim, branch_name: str, branch_idx_lo: int, n_qn_lo: int) -> Li
     Returns:
         Line: The rotational line matching the input parameters.
     """
-    for line in sim.bands[0].lines:
-        if (
-            line.branch_name == branch_name
-            and line.branch_idx_lo == branch_idx_lo
-            and line.n_qn_lo == n_qn_lo
-            and not line.is_satellite
-        ):
-            return line
+    idx: int | None = sim.bands[0].line_lookup.get((branch_name, branch_idx_lo, n_qn_lo, False))
+
+    if idx is not None:
+        return Line(band=sim.bands[0], idx=idx)
 
     raise ValueError("No matching rotational line found.")
 
@@ -272,14 +492,9 @@ def get_rates(sim: Sim, line: Line) -> RateParams:
     g_u: int = constants.ELECTRONIC_DEGENERACIES[sim.molecule.name][sim.state_up.name]
     g_l: int = constants.ELECTRONIC_DEGENERACIES[sim.molecule.name][sim.state_lo.name]
 
-    a21_coeffs: NDArray[np.float64] = np.loadtxt(
-        fname=utils.get_data_path(
-            "data",
-            sim.molecule.name,
-            "einstein",
-            f"{sim.state_up.name}_to_{sim.state_lo.name}_allison.csv",
-        ),
-        delimiter=",",
+    # Einstein A coefficients from Allison et al. in [1/s], indexed by v' and v''.
+    a21_coeffs: NDArray[np.float64] = load_table(
+        sim.molecule.name, "einstein", f"{sim.state_up.name}_to_{sim.state_lo.name}_allison.csv"
     )
 
     # Only a single vibrational band will be simulated at a time.
@@ -306,7 +521,7 @@ def get_rates(sim: Sim, line: Line) -> RateParams:
     return RateParams(a_21, b_12, b_21, w_c, w_d, w_f, w_q)
 
 
-def run_simulation(
+def get_populations(
     molecule: Molecule,
     state_up: State,
     state_lo: State,
@@ -320,8 +535,8 @@ def run_simulation(
     pulse_center: float,
     pulse_width: float,
     fluence: float,
-) -> None:
-    """Plot the population densities, signal, and laser intensity as functions of time.
+) -> tuple[NDArray[np.float64], ...]:
+    """Return the population densities, signal, and laser intensity as functions of time.
 
     Args:
         molecule (Molecule): Molecule of interest.
@@ -337,6 +552,10 @@ def run_simulation(
         pulse_center (float): Center of the laser pulse in [s].
         pulse_width (float): Width of the laser pulse in [s].
         fluence (float): Laser energy per unit area in [J/cm^2].
+
+    Returns:
+        tuple[NDArray[np.float64], ...]: The time domain, the population densities N1, N2, and N3,
+            the signal normalized w.r.t. N2, and the normalized laser intensity.
     """
     sim: Sim = get_sim(molecule, state_up, state_lo, temp, pres, v_qn_up, v_qn_lo)
     line: Line = get_line(sim, branch_name, branch_idx_lo, n_qn_lo)
@@ -354,6 +573,19 @@ def run_simulation(
     il: NDArray[np.float64] = laser_intensity(t, laser_params)
     il /= il.max()
 
+    return t, n1, n2, n3, sf, il
+
+
+def plot_populations(populations: tuple[NDArray[np.float64], ...]) -> None:
+    """Plot the population densities, signal, and laser intensity as functions of time.
+
+    Args:
+        populations (tuple[NDArray[np.float64], ...]): The time domain, the population densities
+            N1, N2, and N3, the signal normalized w.r.t. N2, and the normalized laser intensity, as
+            returned by `get_populations`.
+    """
+    t, n1, n2, n3, sf, il = populations
+
     _, ax1 = plt.subplots()
     ax1.set_xlabel("Time, $t$ [s]")
     ax1.set_ylabel("$N_{1}$, $N_{3}$, $I_{L}$, Normalized")
@@ -410,18 +642,17 @@ def scan_fluences(
     sim: Sim = get_sim(molecule, state_up, state_lo, temp, pres, v_qn_up, v_qn_lo)
     line: Line = get_line(sim, branch_name, branch_idx_lo, n_qn_lo)
     rate_params: RateParams = get_rates(sim, line)
-    t: NDArray[np.float64] = np.linspace(MIN_TIME, MAX_TIME, N_TIME, dtype=np.float64)
+    t: NDArray[np.float64] = np.linspace(MIN_TIME, MAX_TIME, N_TIME_SCAN, dtype=np.float64)
 
     fluences: NDArray[np.float64] = np.linspace(0.0, max_fluence, N_FLUENCE, dtype=np.float64)
-    signals: NDArray[np.float64] = np.zeros_like(fluences)
 
-    for idx, fluence in enumerate(fluences):
-        laser_params = LaserParams(pulse_center, pulse_width, fluence)
+    laser_params: LaserParams = LaserParams(pulse_center, pulse_width, 1.0)
 
-        _, n2, _ = simulate(t, rate_params, laser_params, line)
+    _, n2, _ = simulate_fluences(t, rate_params, laser_params, line, fluences)
 
-        signal: NDArray[np.float64] = get_signal(t, n2, rate_params)
-        signals[idx] = signal.max()
+    # N2 is never negative, so the integrated signal never decreases and its peak is simply the
+    # integral over the whole time domain.
+    signals: NDArray[np.float64] = rate_params.w_f * np.trapezoid(n2, t, axis=1)
 
     return fluences, signals / signals.max()
 
@@ -467,13 +698,10 @@ def n2_vs_time_and_fluence(
     rate_params: RateParams = get_rates(sim, line)
     t: NDArray[np.float64] = np.linspace(MIN_TIME, MAX_TIME, N_TIME, dtype=np.float64)
 
-    fluences: NDArray[np.float64] = np.linspace(0.0, max_fluence, N_FLUENCE, dtype=np.float64)
-    n2_populations: NDArray[np.float64] = np.zeros((len(fluences), len(t)))
+    laser_params: LaserParams = LaserParams(pulse_center, pulse_width, 1.0)
 
-    for idx, fluence in enumerate(fluences):
-        laser_params: LaserParams = LaserParams(pulse_center, pulse_width, fluence)
-        _, n2, _ = simulate(t, rate_params, laser_params, line)
-        n2_populations[idx, :] = n2
+    fluences: NDArray[np.float64] = np.linspace(0.0, max_fluence, N_FLUENCE, dtype=np.float64)
+    _, n2_populations, _ = simulate_fluences(t, rate_params, laser_params, line, fluences)
 
     return fluences, t, n2_populations
 
@@ -509,37 +737,41 @@ def main() -> None:
 
     # NOTE: 24/10/29 - For now, laser fluence should be specified in [J/cm^2].
 
-    run_simulation(
+    # Compute everything before plotting so that the figures are shown back to back.
+    populations_low: tuple[NDArray[np.float64], ...] = get_populations(
         molecule, state_up, state_lo, 300, 101325, 15, 3, "R", 1, 11, 30e-9, 20e-9, 25e-3
     )
-    run_simulation(
+    populations_high: tuple[NDArray[np.float64], ...] = get_populations(
+        molecule, state_up, state_lo, 300, 101325, 15, 3, "R", 1, 11, 30e-9, 20e-9, 1000e-3
+    )
+    f1, sf1 = scan_fluences(
+        molecule, state_up, state_lo, 1800, 101325, 2, 7, "P", 1, 9, 30e-9, 20e-9, 42.5e-3
+    )
+    f2, sf2 = scan_fluences(
+        molecule, state_up, state_lo, 1800, 101325, 0, 6, "R", 1, 17, 30e-9, 20e-9, 43e-3
+    )
+    fluences, t, n2_populations = n2_vs_time_and_fluence(
         molecule, state_up, state_lo, 300, 101325, 15, 3, "R", 1, 11, 30e-9, 20e-9, 1000e-3
     )
 
+    plot_populations(populations_low)
+    plot_populations(populations_high)
+
     jay_27_p9x: NDArray[np.float64] = np.array([0, 1.8, 3.6, 6, 12, 24, 42.5]) / 1e3
     jay_27_p9y: NDArray[np.float64] = np.array([0, 0.08, 0.15, 0.27, 0.47, 0.7, 1])
     plt.scatter(jay_27_p9x, jay_27_p9y)
-    f, sf = scan_fluences(
-        molecule, state_up, state_lo, 1800, 101325, 2, 7, "P", 1, 9, 30e-9, 20e-9, 42.5e-3
-    )
-    plt.plot(f, sf, label="(2, 7)")
+    plt.plot(f1, sf1, label="(2, 7)")
 
     jay_06_r17x: NDArray[np.float64] = np.array([0, 2, 3.8, 7, 12.1, 23, 43]) / 1e3
     jay_06_r17y: NDArray[np.float64] = np.array([0, 0.025, 0.06, 0.12, 0.27, 0.55, 1])
     plt.scatter(jay_06_r17x, jay_06_r17y)
-    f, sf = scan_fluences(
-        molecule, state_up, state_lo, 1800, 101325, 0, 6, "R", 1, 17, 30e-9, 20e-9, 43e-3
-    )
-    plt.plot(f, sf, label="(0, 6)")
+    plt.plot(f2, sf2, label="(0, 6)")
 
     plt.xlabel("Laser Fluence, $\\Phi$ [J/cm$^{2}$]")
     plt.ylabel("Signal, $S_{f}$ [a.u.]")
     plt.legend()
     plt.show()
 
-    fluences, t, n2_populations = n2_vs_time_and_fluence(
-        molecule, state_up, state_lo, 300, 101325, 15, 3, "R", 1, 11, 30e-9, 20e-9, 1000e-3
-    )
     plot_n2_vs_time_and_fluence(fluences, t, n2_populations)
 
 
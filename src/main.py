@@ -16,8 +16,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from __future__ import annotations
+
+import re
 import sys
 import time
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -29,18 +34,32 @@ from PySide6.QtCore import (
     QModelIndex,
     QObject,
     QPoint,
+    QPointF,
     QRect,
+    QRunnable,
     Qt,
+    QThreadPool,
     QTimer,
     Signal,
 )
-from PySide6.QtGui import QColor, QFont, QIcon, QPainter, QPaintEvent, QPen, QValidator
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QIcon,
+    QPainter,
+    QPaintEvent,
+    QPen,
+    QStaticText,
+    QTransform,
+    QValidator,
+)
 from PySide6.QtWidgets import (
     QApplication,
     QCheckBox,
     QComboBox,
     QDoubleSpinBox,
     QFileDialog,
+    QGraphicsItem,
     QGridLayout,
     QGroupBox,
     QHBoxLayout,
@@ -51,6 +70,9 @@ from PySide6.QtWidgets import (
     QPushButton,
     QRadioButton,
     QSpinBox,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QTableView,
     QTabWidget,
     QVBoxLayout,
@@ -71,13 +93,32 @@ if TYPE_CHECKING:
 
     from numpy.typing import NDArray
 
+    from band import Band
+
 DEFAULT_LINES: int = 40
 DEFAULT_GRANULARITY: int = int(1e4)
 
+# Bounds on the number of points used for the convolution grid when only a few lines are simulated.
+MIN_GRANULARITY: int = 1000
+POINTS_PER_LINE: int = 100
+
 DEFAULT_TEMPERATURE: float = 300.0  # [K]
 DEFAULT_PRESSURE: float = 101325.0  # [Pa]
 DEFAULT_BROADENING: float = 0.0  # [nm]
 
+# Column types of the rotational line tables. The quantum numbers are stored by each band as 64-bit
+# integers, so no columns need to be cast when the tables are built.
+LINE_SCHEMA: dict[str, type[pl.DataType]] = {
+    "Wavelength": pl.Float64,
+    "Wavenumber": pl.Float64,
+    "Intensity": pl.Float64,
+    "J'": pl.Int64,
+    "J''": pl.Int64,
+    "N'": pl.Int64,
+    "N''": pl.Int64,
+    "Branch": pl.String,
+}
+
 DEFAULT_BANDS: str = "0-0"
 DEFAULT_PLOTTYPE: str = "Line"
 DEFAULT_SIMTYPE: str = "Absorption"
@@ -90,6 +131,10 @@ class MyDoubleSpinBox(QDoubleSpinBox):
     notation.
     """
 
+    # Validation runs on every keystroke, so the accepted patterns are compiled only once.
+    _full: re.Pattern[str] = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+    _partial: re.Pattern[str] = re.compile(r"^[+-]?((\d+\.?\d*|\.\d*)([eE][+-]?\d*)?)?$")
+
     def __init__(self) -> None:
         """Initialize class variables."""
         super().__init__()
@@ -132,20 +177,15 @@ class MyDoubleSpinBox(QDoubleSpinBox):
         Returns:
             tuple[QValidator.State, str, int]: The current state, input text, and string position.
         """
-        if text == "":
+        if not text:
             return (QValidator.State.Intermediate, text, pos)
-        try:
-            float(text)
+        if self._full.match(text):
             return (QValidator.State.Acceptable, text, pos)
-        except ValueError:
-            # If the string cannot immediately be converted to a float, first check for scientific
-            # notation and return an intermediate state if found.
-            if "e" in text.lower():
-                parts: list[str] = text.lower().split("e")
-                num_parts: int = 2
-                if len(parts) == num_parts and (parts[1] == "" or parts[1] in ["-", "+"]):
-                    return (QValidator.State.Intermediate, text, pos)
-            return (QValidator.State.Invalid, text, pos)
+        # Incomplete input such as a lone sign or an exponent without digits, e.g. "-", "1e", or
+        # "1e-", is allowed while the user is still typing.
+        if self._partial.match(text):
+            return (QValidator.State.Intermediate, text, pos)
+        return (QValidator.State.Invalid, text, pos)
 
 
 class MyTable(QAbstractTableModel):
@@ -159,6 +199,44 @@ class MyTable(QAbstractTableModel):
         """
         super().__init__()
         self.df: pl.DataFrame = df
+        self.rows_display: list[tuple[str, ...]] = self.get_rows_display()
+
+    def set_dataframe(self, df: pl.DataFrame) -> None:
+        """Replace the displayed DataFrame, allowing the model and its views to be reused.
+
+        Args:
+            df (pl.DataFrame): A Polars `DataFrame`.
+        """
+        self.beginResetModel()
+        self.df = df
+        self.rows_display = self.get_rows_display()
+        self.endResetModel()
+
+    def get_rows_display(self) -> list[tuple[str, ...]]:
+        """Return every value of the DataFrame formatted as a string for display.
+
+        Formatting is done once per column here instead of once per cell each time the view is
+        painted. The text is stored row by row in plain Python containers so that `data` is a
+        single list lookup.
+
+        Returns:
+            list[tuple[str, ...]]: The formatted text of each cell, indexed by row and column.
+        """
+        # NOTE: 25/04/10 - This only changes the values displayed to the user using the built-in
+        #       table view. If the table is exported, the underlying dataframe is used instead,
+        #       which retains the full-precision values calculated by the simulation.
+        columns: list[pl.Series] = []
+
+        for column in self.df.iter_columns():
+            if column.dtype.is_float():
+                fmt: str = "%.4e" if "Intensity" in column.name else "%.4f"
+                columns.append(
+                    pl.Series(column.name, np.char.mod(fmt, column.to_numpy()), dtype=pl.String)
+                )
+            else:
+                columns.append(column.cast(pl.String))
+
+        return pl.DataFrame(columns).rows()
 
     def rowCount(self, _: QModelIndex = QModelIndex()) -> int:  # noqa: N802
         """Get the height of the table.
@@ -195,18 +273,7 @@ class MyTable(QAbstractTableModel):
         if not index.isValid():
             return None
         if role == Qt.ItemDataRole.DisplayRole:
-            value: int | float | str = self.df[index.row(), index.column()]
-            column_name: str = self.df.columns[index.column()]
-
-            # NOTE: 25/04/10 - This only changes the values displayed to the user using the built-in
-            #       table view. If the table is exported, the underlying dataframe is used instead,
-            #       which retains the full-precision values calculated by the simulation.
-            if isinstance(value, float):
-                if "Intensity" in column_name:
-                    return f"{value:.4e}"
-                return f"{value:.4f}"
-
-            return str(value)
+            return self.rows_display[index.row()][index.column()]
         return None
 
     def headerData(  # noqa: N802
@@ -232,6 +299,95 @@ class MyTable(QAbstractTableModel):
         return None
 
 
+class StaticTextDelegate(QStyledItemDelegate):
+    """An item delegate that caches the text layout of each table cell.
+
+    The table contents never change once a model is created, so the glyph layout of each cell is
+    computed once with `QStaticText` instead of every time the cell is painted.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        """Initialize class variables.
+
+        Args:
+            parent (QObject | None, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.static_texts: dict[tuple[int, int], QStaticText] = {}
+
+    def clear_cache(self) -> None:
+        """Remove all cached text layouts, e.g. after the model has been reset."""
+        self.static_texts.clear()
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        """Draw the cached text of a single cell.
+
+        Args:
+            painter (QPainter): Performs the painting.
+            option (QStyleOptionViewItem): Describes the parameters used to draw the item.
+            index (QModelIndex): Locates the item within the model.
+        """
+        key: tuple[int, int] = (index.row(), index.column())
+        static_text: QStaticText | None = self.static_texts.get(key)
+
+        if static_text is None:
+            static_text = QStaticText(str(index.data()))
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.prepare(QTransform(), option.font)
+            self.static_texts[key] = static_text
+
+        painter.save()
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+
+        painter.setFont(option.font)
+
+        # Left-align the text with a small margin and center it vertically within the cell.
+        margin: int = 3
+        painter.drawStaticText(
+            QPointF(
+                option.rect.left() + margin,
+                option.rect.top() + (option.rect.height() - static_text.size().height()) / 2,
+            ),
+            static_text,
+        )
+
+        painter.restore()
+
+
+def band_dataframe(band: Band) -> pl.DataFrame:
+    """Return a DataFrame containing the rotational line data of a vibrational band.
+
+    Args:
+        band (Band): The vibrational band.
+
+    Returns:
+        pl.DataFrame: One row for each rotational line.
+    """
+    # The line data is already stored by each band as arrays, so the columns are taken from there
+    # directly without creating any `Line` objects.
+    return pl.DataFrame(
+        {
+            "Wavelength": utils.wavenum_to_wavelen(band.wavenumbers),
+            "Wavenumber": band.wavenumbers,
+            "Intensity": band.intensities,
+            "J'": band.j_qn_up,
+            "J''": band.j_qn_lo,
+            "N'": band.n_qn_up,
+            "N''": band.n_qn_lo,
+            "Branch": np.char.add(
+                np.char.add(band.branch_name, band.branch_idx_up.astype(str)),
+                band.branch_idx_lo.astype(str),
+            ),
+        },
+        schema=LINE_SCHEMA,
+    )
+
+
 def create_dataframe_tab(df: pl.DataFrame, _: str) -> QWidget:
     """Create a QWidget containing a QTableView to display the DataFrame.
 
@@ -248,6 +404,10 @@ def create_dataframe_tab(df: pl.DataFrame, _: str) -> QWidget:
     model: MyTable = MyTable(df)
     table_view.setModel(model)
 
+    delegate: StaticTextDelegate = StaticTextDelegate(table_view)
+    model.modelReset.connect(delegate.clear_cache)
+    table_view.setItemDelegate(delegate)
+
     # TODO: 25/04/10 - Enabling column resizing dramatically increases the time it takes to render
     #       tables with even a moderate number of bands. Keeping this disabled unless there's a
     #       faster way to achieve the same thing.
@@ -276,6 +436,13 @@ class GUI(QMainWindow):
         #
         # pg.setConfigOptions(antialias=True, useOpenGL=True)
 
+        # The molecule and its electronic states do not depend on any user input. Their constants
+        # are read from disk, so they are only created once and shared by every simulation.
+        atom: Atom = Atom("O")
+        self.molecule: Molecule = Molecule(name="O2", atom_1=atom, atom_2=atom)
+        self.state_up: State = State(name="B3Su-", spin_multiplicity=3, molecule=self.molecule)
+        self.state_lo: State = State(name="X3Sg-", spin_multiplicity=3, molecule=self.molecule)
+
         self.setWindowTitle("pyGEONOSIS")
         self.resize(1600, 800)
         self.center()
@@ -461,8 +628,10 @@ class GUI(QMainWindow):
         main_widget: QWidget = QWidget()
         layout: QHBoxLayout = QHBoxLayout(main_widget)
 
-        # Tabs containing tables.
+        # Tabs containing tables. The tables of simulated bands are populated when first selected.
         self.tab_widget: QTabWidget = QTabWidget()
+        self.pending_tabs: dict[QWidget, Band] = {}
+        self.tab_widget.currentChanged.connect(self.populate_tab)
         empty_df: pl.DataFrame = pl.DataFrame()
         empty_tab: QWidget = create_dataframe_tab(empty_df, "v'-v''")
         self.tab_widget.addTab(empty_tab, "v'-v''")
@@ -590,8 +759,11 @@ class GUI(QMainWindow):
         )
         if filename:
             try:
-                df: pl.DataFrame = pl.read_csv(filename)
-            except ValueError:
+                # Only the columns that are plotted are parsed from the file.
+                df: pl.DataFrame = (
+                    pl.scan_csv(filename).select(["wavenumber", "intensity"]).collect()
+                )
+            except (ValueError, pl.exceptions.PolarsError):
                 QMessageBox.critical(self, "Error", "Data is improperly formatted.")
                 return
         else:
@@ -602,8 +774,14 @@ class GUI(QMainWindow):
         new_tab: QWidget = create_dataframe_tab(df, display_name)
         self.tab_widget.addTab(new_tab, display_name)
 
-        wavenumbers: NDArray[np.float64] = df["wavenumber"].to_numpy()
-        intensities: NDArray[np.float64] = df["intensity"].to_numpy()
+        # The plotted arrays are read-only views of the Polars buffers whenever possible. A copy is
+        # only made if a column is split into several chunks or contains nulls.
+        try:
+            wavenumbers: NDArray[np.float64] = df["wavenumber"].to_numpy(allow_copy=False)
+            intensities: NDArray[np.float64] = df["intensity"].to_numpy(allow_copy=False)
+        except RuntimeError:
+            wavenumbers = df["wavenumber"].to_numpy()
+            intensities = df["intensity"].to_numpy()
 
         plot.plot_sample(self.plot_widget, wavenumbers, intensities, display_name)
 
@@ -667,7 +845,7 @@ class GUI(QMainWindow):
 
     def add_simulation(self) -> None:
         """Run a simulation instance, then update the plot and table tabs."""
-        start_time: float = time.time()
+        start_time: int = time.perf_counter_ns()
 
         # TODO: 25/04/14 - Split this method up. Process the temperature mode, parse the bands,
         #       create the simulation, plot the data, and finally make a new tab in the table.
@@ -709,45 +887,94 @@ class GUI(QMainWindow):
                 )
                 return
 
-            # Generate band combinations based on the given ranges.
-            if (v_up_min == v_up_max) and (v_lo_min == v_lo_max):
-                bands = [(v_up_min, v_lo_min)]
-            elif v_up_min == v_up_max:
-                bands = [(v_up_min, v_lo) for v_lo in range(v_lo_min, v_lo_max + 1)]
-            elif v_lo_min == v_lo_max:
-                bands = [(v_up, v_lo_min) for v_up in range(v_up_min, v_up_max + 1)]
-            else:
-                bands = [
-                    (v_up, v_lo)
-                    for v_up in range(v_up_min, v_up_max + 1)
-                    for v_lo in range(v_lo_min, v_lo_max + 1)
-                ]
+            # Generate band combinations based on the given ranges. Degenerate ranges (min == max)
+            # simply produce a single row or column of the grid.
+            v_up_grid, v_lo_grid = np.meshgrid(
+                np.arange(v_up_min, v_up_max + 1), np.arange(v_lo_min, v_lo_max + 1), indexing="ij"
+            )
+            bands = list(zip(v_up_grid.ravel().tolist(), v_lo_grid.ravel().tolist(), strict=True))
 
         rot_lvls: NDArray[np.int64] = np.arange(0, self.num_lines_spinbox.value())
 
-        molecule: Molecule = Molecule(name="O2", atom_1=Atom("O"), atom_2=Atom("O"))
-        state_up: State = State(name="B3Su-", spin_multiplicity=3, molecule=molecule)
-        state_lo: State = State(name="X3Sg-", spin_multiplicity=3, molecule=molecule)
-
-        sim: Sim = Sim(
-            sim_type=sim_type,
-            molecule=molecule,
-            state_up=state_up,
-            state_lo=state_lo,
-            rot_lvls=rot_lvls,
-            temp_trn=temp_trn,
-            temp_elc=temp_elc,
-            temp_vib=temp_vib,
-            temp_rot=temp_rot,
-            pressure=pres,
-            bands=bands,
+        # Check which FWHM parameters the user has selected.
+        fwhm_selections: dict[str, bool] = {
+            "instrument": self.checkbox_instrument.isChecked(),
+            "doppler": self.checkbox_doppler.isChecked(),
+            "natural": self.checkbox_natural.isChecked(),
+            "collisional": self.checkbox_collisional.isChecked(),
+            "predissociation": self.checkbox_predissociation.isChecked(),
+        }
+
+        # The simulation runs on a worker thread so that the window stays responsive. All of the
+        # settings are read here, since the widgets must only be accessed from the GUI thread.
+        self.sim_worker: SimulationWorker = SimulationWorker(
+            partial(
+                Sim,
+                sim_type=sim_type,
+                molecule=self.molecule,
+                state_up=self.state_up,
+                state_lo=self.state_lo,
+                rot_lvls=rot_lvls,
+                temp_trn=temp_trn,
+                temp_elc=temp_elc,
+                temp_vib=temp_vib,
+                temp_rot=temp_rot,
+                pressure=pres,
+                bands=bands,
+            ),
+            bands,
+            self.plot_type_combo.currentText(),
+            ConvolutionSettings(
+                fwhm_selections,
+                self.inst_broadening_spinbox.value(),
+                self.granularity_spinbox.value(),
+            ),
+        )
+        self.sim_worker.signals.finished.connect(self.on_simulation_finished)
+        self.sim_worker.signals.failed.connect(self.on_simulation_failed)
+
+        self.sim_start_time: int = start_time
+        self.run_button.setEnabled(False)
+
+        QThreadPool.globalInstance().start(self.sim_worker)
+
+    def on_simulation_failed(self, message: str) -> None:
+        """Report an error raised while running the simulation.
+
+        Args:
+            message (str): The error message.
+        """
+        self.run_button.setEnabled(True)
+
+        QMessageBox.critical(
+            self, "Error", f"Simulation failed: {message}", QMessageBox.StandardButton.Ok
         )
 
-        print(f"Time to create sim: {time.time() - start_time} s")
-        start_plot_time: float = time.time()
+    def on_simulation_finished(self, sim: Sim) -> None:
+        """Update the plot and table tabs once the simulation has finished.
+
+        Args:
+            sim (Sim): The completed simulation.
+        """
+        start_time: int = self.sim_start_time
+        worker: SimulationWorker = self.sim_worker
+        bands: list[tuple[int, int]] = worker.bands
+
+        # Timings are collected in nanoseconds and reported together once everything is done.
+        timings: list[tuple[str, int]] = [
+            ("Time to create sim", time.perf_counter_ns() - start_time)
+        ]
+        start_plot_time: int = time.perf_counter_ns()
 
         colors: list[str] = get_colors(bands)
 
+        self.report_granularity(sim, worker.conv_settings.granularity)
+
+        # Suspend auto-ranging while the curves are replaced, otherwise the view range is recomputed
+        # for each item that is removed or added.
+        plot_item: pg.PlotItem = self.plot_widget.getPlotItem()
+        plot_item.disableAutoRange()
+
         self.plot_widget.clear()
 
         # Map plot types to functions.
@@ -757,27 +984,18 @@ class GUI(QMainWindow):
             "Convolve Separate": plot.plot_conv_sep,
             "Convolve All": plot.plot_conv_all,
         }
-        plot_type: str = self.plot_type_combo.currentText()
+        plot_type: str = worker.plot_type
         plot_function: Callable | None = map_functions.get(plot_type)
 
-        # Check which FWHM parameters the user has selected.
-        fwhm_selections: dict[str, bool] = {
-            "instrument": self.checkbox_instrument.isChecked(),
-            "doppler": self.checkbox_doppler.isChecked(),
-            "natural": self.checkbox_natural.isChecked(),
-            "collisional": self.checkbox_collisional.isChecked(),
-            "predissociation": self.checkbox_predissociation.isChecked(),
-        }
-
         if plot_function is not None:
             if plot_function.__name__ in ("plot_conv_sep", "plot_conv_all"):
                 plot_function(
                     self.plot_widget,
                     sim,
                     colors,
-                    fwhm_selections,
-                    self.inst_broadening_spinbox.value(),
-                    self.granularity_spinbox.value(),
+                    worker.conv_settings.fwhm_selections,
+                    worker.conv_settings.inst_broadening_wl,
+                    worker.conv_settings.granularity,
                 )
             else:
                 plot_function(self.plot_widget, sim, colors)
@@ -789,39 +1007,99 @@ class GUI(QMainWindow):
                 QMessageBox.StandardButton.Ok,
             )
 
-        self.plot_widget.autoRange()
+        # Cache the rendered curves so that they are not re-rasterized when only other items in
+        # the scene (e.g. the legend) change.
+        for item in self.plot_widget.listDataItems():
+            item.curve.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+        plot_item.enableAutoRange()
 
-        print(f"Time to create plot: {time.time() - start_plot_time} s")
-        start_table_time: float = time.time()
+        timings.append(("Time to create plot", time.perf_counter_ns() - start_plot_time))
+        start_table_time: int = time.perf_counter_ns()
 
-        # Clear previous tabs.
-        while self.tab_widget.count() > 0:
-            self.tab_widget.removeTab(0)
+        # Rebuild all tabs in one go. Signals are blocked so that `currentChanged` is not emitted
+        # for every tab that is removed or added, and repainting is deferred until the end.
+        self.tab_widget.setUpdatesEnabled(False)
+        self.tab_widget.blockSignals(True)
 
-        # Create a new tab for each vibrational band.
+        # Existing tabs are reused for the new bands, so only surplus tabs are destroyed.
+        while self.tab_widget.count() > len(bands):
+            surplus_tab: QWidget = self.tab_widget.widget(len(bands))
+            self.tab_widget.removeTab(len(bands))
+            surplus_tab.deleteLater()
+
+        self.pending_tabs.clear()
+
+        # Mark the tab of each vibrational band as pending. Tables are only built or refilled once
+        # their tab is shown, see `populate_tab`.
         for i, band in enumerate(bands):
-            df: pl.DataFrame = pl.DataFrame(
-                [
-                    {
-                        "Wavelength": utils.wavenum_to_wavelen(line.wavenumber),
-                        "Wavenumber": line.wavenumber,
-                        "Intensity": line.intensity,
-                        "J'": line.j_qn_up,
-                        "J''": line.j_qn_lo,
-                        "N'": line.n_qn_up,
-                        "N''": line.n_qn_lo,
-                        "Branch": f"{line.branch_name}{line.branch_idx_up}{line.branch_idx_lo}",
-                    }
-                    for line in sim.bands[i].lines
-                ]
+            tab_name: str = f"{band[0]}-{band[1]}"
+
+            if i < self.tab_widget.count():
+                tab: QWidget = self.tab_widget.widget(i)
+                self.tab_widget.setTabText(i, tab_name)
+            else:
+                tab = QWidget()
+                self.tab_widget.addTab(tab, tab_name)
+
+            self.pending_tabs[tab] = sim.bands[i]
+
+        self.tab_widget.blockSignals(False)
+        self.tab_widget.setUpdatesEnabled(True)
+
+        # Since `currentChanged` was blocked, the table of the initially selected tab is built here.
+        self.populate_tab(self.tab_widget.currentIndex())
+
+        timings.append(("Time to create table", time.perf_counter_ns() - start_table_time))
+        timings.append(("Total time", time.perf_counter_ns() - start_time))
+
+        print("\n".join(f"{name}: {ns / 1e6:.2f} ms" for name, ns in timings) + "\n")
+
+        self.run_button.setEnabled(True)
+
+    def report_granularity(self, sim: Sim, granularity: int) -> None:
+        """Show in the status bar whether a quick preview was convolved on a coarser grid.
+
+        The granularity spinbox still shows the requested value, so the reduction would otherwise
+        go unnoticed.
+
+        Args:
+            sim (Sim): The completed simulation.
+            granularity (int): Number of points actually used on the wavenumber axis.
+        """
+        if granularity < self.granularity_spinbox.value():
+            self.statusBar().showMessage(
+                f"Granularity reduced to {granularity} points for a preview of "
+                f"{sim.rot_lvls.size} rotational levels."
             )
+        else:
+            self.statusBar().clearMessage()
 
-            tab_name: str = f"{band[0]}-{band[1]}"
-            new_tab: QWidget = create_dataframe_tab(df, tab_name)
-            self.tab_widget.addTab(new_tab, tab_name)
+    def populate_tab(self, index: int) -> None:
+        """Fill the table of a vibrational band once its tab is shown.
 
-        print(f"Time to create table: {time.time() - start_table_time} s")
-        print(f"Total time: {time.time() - start_time} s\n")
+        Args:
+            index (int): Index of the newly selected tab.
+        """
+        tab: QWidget = self.tab_widget.widget(index)
+        band: Band | None = self.pending_tabs.pop(tab, None)
+
+        if band is None:
+            return
+
+        df: pl.DataFrame = band_dataframe(band)
+
+        # Tabs kept from a previous simulation already contain a table view, so only its data is
+        # replaced.
+        table_view: QTableView | None = tab.findChild(QTableView)
+
+        if table_view is not None:
+            table_view.model().set_dataframe(df)
+            return
+
+        layout: QVBoxLayout = QVBoxLayout(tab)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(create_dataframe_tab(df, self.tab_widget.tabText(index)))
 
     def export_current_table(self) -> None:
         """Export the currently displayed table to a CSV file."""
@@ -880,16 +1158,115 @@ class WavenumberAxis(pg.AxisItem):
         Returns:
             list[str]: List of wavenumber values placed next to ticks.
         """
-        strings: list[str] = []
+        # The same ticks are requested on every repaint while panning or zooming, so the formatted
+        # strings are cached by their wavelengths.
+        return list(wavenumber_tick_strings(tuple(wavelengths)))
 
-        for wavelength in wavelengths:
-            if wavelength != 0:
-                wavenumber: float = utils.wavenum_to_wavelen(wavelength)
-                strings.append(f"{wavenumber:.1f}")
-            else:
-                strings.append("∞")
 
-        return strings
+@lru_cache(maxsize=64)
+def wavenumber_tick_strings(wavelengths: tuple[float, ...]) -> tuple[str, ...]:
+    """Return the wavenumber strings corresponding to a set of wavelength ticks.
+
+    Args:
+        wavelengths (tuple[float, ...]): Wavelength values of the ticks.
+
+    Returns:
+        tuple[str, ...]: Wavenumber values placed next to the ticks.
+    """
+    wavelengths_arr: NDArray[np.float64] = np.asarray(wavelengths, dtype=np.float64)
+    is_zero: NDArray[np.bool_] = wavelengths_arr == 0
+
+    # A tick at zero wavelength corresponds to an infinite wavenumber, so it is excluded from the
+    # conversion and labeled separately.
+    wavenumbers: NDArray[np.float64] = utils.wavenum_to_wavelen(
+        np.where(is_zero, 1.0, wavelengths_arr)
+    )
+
+    return tuple(np.where(is_zero, "∞", np.char.mod("%.1f", wavenumbers)).tolist())
+
+
+@dataclass
+class ConvolutionSettings:
+    """Holds the settings used to convolve the simulated spectra.
+
+    Attributes:
+        fwhm_selections (dict[str, bool]): The types of broadening to be simulated.
+        inst_broadening_wl (float): Instrument broadening FWHM in [nm].
+        granularity (int): Number of points on the wavenumber axis.
+    """
+
+    fwhm_selections: dict[str, bool]
+    inst_broadening_wl: float
+    granularity: int
+
+
+class SimulationSignals(QObject):
+    """Signals emitted by a `SimulationWorker`."""
+
+    finished: Signal = Signal(object)
+    failed: Signal = Signal(str)
+
+
+class SimulationWorker(QRunnable):
+    """Runs a simulation and computes its plotted data away from the GUI thread."""
+
+    def __init__(
+        self,
+        create_sim: Callable[[], Sim],
+        bands: list[tuple[int, int]],
+        plot_type: str,
+        conv_settings: ConvolutionSettings,
+    ) -> None:
+        """Initialize class variables.
+
+        Args:
+            create_sim (Callable[[], Sim]): Constructs the simulation.
+            bands (list[tuple[int, int]]): Which vibrational bands to simulate.
+            plot_type (str): The selected plot type.
+            conv_settings (ConvolutionSettings): Broadening and grid settings for the convolution.
+        """
+        super().__init__()
+        self.create_sim: Callable[[], Sim] = create_sim
+        self.bands: list[tuple[int, int]] = bands
+        self.plot_type: str = plot_type
+        self.conv_settings: ConvolutionSettings = conv_settings
+        self.signals: SimulationSignals = SimulationSignals()
+
+    def run(self) -> None:
+        """Create the simulation and emit it once finished."""
+        try:
+            sim: Sim = self.create_sim()
+            settings: ConvolutionSettings = self.conv_settings
+
+            # A dense wavenumber grid is wasted on a quick preview with only a few lines, so the
+            # number of points is capped relative to the number of lines being convolved. The cap
+            # only applies once the number of rotational levels has been reduced below the default,
+            # so the granularity chosen for a normal run is always respected.
+            if sim.rot_lvls.size < DEFAULT_LINES:
+                num_lines: int = sim.line_index["n_qn_up"].size * len(sim.bands)
+                settings.granularity = min(
+                    settings.granularity, max(MIN_GRANULARITY, num_lines * POINTS_PER_LINE)
+                )
+
+            # The convolved spectra are the most expensive part of plotting. Both the bands and the
+            # simulation cache them, so computing them here means that the plotting functions only
+            # need to look up the results on the GUI thread.
+            if self.plot_type == "Convolve All":
+                sim.all_conv_data(
+                    settings.fwhm_selections, settings.inst_broadening_wl, settings.granularity
+                )
+            elif self.plot_type == "Convolve Separate":
+                for band in sim.bands:
+                    band.intensities_conv(
+                        settings.fwhm_selections,
+                        settings.inst_broadening_wl,
+                        band.wavenumbers_conv(settings.inst_broadening_wl, settings.granularity),
+                    )
+        except Exception as e:  # noqa: BLE001
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.finished.emit(sim)
 
 
 class LoadingWorker(QObject):
@@ -16,8 +16,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import TYPE_CHECKING
-
 import numpy as np
 import pyqtgraph as pg
 from numpy.typing import NDArray
@@ -25,11 +23,22 @@ from numpy.typing import NDArray
 import utils
 from sim import Sim
 
-if TYPE_CHECKING:
-    from line import Line
-
 PEN_WIDTH: int = 1
 
+# Plotted intensities are handed to pyqtgraph as single precision, which reduces the memory traffic
+# of clipping and downsampling. Wavelengths are kept in double precision: near 200 nm the spacing
+# between single-precision numbers is ~1.5e-5 nm, which is coarser than the step of a fine grid
+# (4.4e-6 nm for 1e6 points across a single band), so neighboring points would collapse together.
+PLOT_DTYPE: type[np.float32] = np.float32
+
+# Continuous spectra can contain far more points than there are pixels on screen, so only the
+# visible portion of each curve is drawn and it is decimated (keeping the peaks) when zoomed out.
+CURVE_OPTIONS: dict[str, bool | str] = {
+    "autoDownsample": True,
+    "downsampleMethod": "peak",
+    "clipToView": True,
+}
+
 
 def plot_sample(
     plot_widget: pg.PlotWidget,
@@ -49,9 +58,10 @@ def plot_sample(
 
     plot_widget.plot(
         wavelengths,
-        intensities / intensities.max(),
+        np.divide(intensities, intensities.max(), dtype=PLOT_DTYPE),
         pen=pg.mkPen("w", width=PEN_WIDTH),
         name=display_name,
+        **CURVE_OPTIONS,
     )
 
 
@@ -63,28 +73,25 @@ def plot_line(plot_widget: pg.PlotWidget, sim: Sim, colors: list[str]) -> None:
         sim (Sim): The parent simulation.
         colors (list[str]): A list of colors for plotting.
     """
-    max_intensity: float = sim.all_line_data()[1].max()
+    # The maximum is taken over each band directly instead of concatenating all of their lines.
+    max_intensity: float = max(band.intensities_line().max() for band in sim.bands)
 
     for idx, band in enumerate(sim.bands):
-        wavelengths_line: NDArray[np.float64] = utils.wavenum_to_wavelen(band.wavenumbers_line())
-        intensities_line: NDArray[np.float64] = band.intensities_line()
-
-        # Create a scatter plot with points at zero and peak intensity.
-        scatter_data: NDArray[np.float64] = np.column_stack(
-            [
-                np.repeat(wavelengths_line, 2),
-                np.column_stack(
-                    [np.zeros_like(wavelengths_line), intensities_line / max_intensity]
-                ).flatten(),
-            ],
-        ).astype(np.float64)
+        # Each line is drawn as a segment from zero up to its peak intensity, so every wavelength is
+        # repeated twice and the intensities alternate between zero and the normalized peak.
+        wavelengths_pairs: NDArray[np.float64] = np.repeat(
+            utils.wavenum_to_wavelen(band.wavenumbers_line()), 2
+        )
+        intensities_pairs: NDArray[np.float32] = np.zeros(wavelengths_pairs.size, dtype=PLOT_DTYPE)
+        np.divide(band.intensities_line(), max_intensity, out=intensities_pairs[1::2])
 
         plot_widget.plot(
-            scatter_data[:, 0],
-            scatter_data[:, 1],
+            wavelengths_pairs,
+            intensities_pairs,
             pen=pg.mkPen(colors[idx], width=PEN_WIDTH),
             connect="pairs",
             name=f"{sim.molecule.name} {band.v_qn_up, band.v_qn_lo} line",
+            skipFiniteCheck=True,
         )
 
 
@@ -99,20 +106,29 @@ def plot_line_info(plot_widget: pg.PlotWidget, sim: Sim, colors: list[str]) -> N
     # In order to show text, a plot must first exist.
     plot_line(plot_widget, sim, colors)
 
-    max_intensity: float = sim.all_line_data()[1].max()
+    max_intensity: float = max(band.intensities_line().max() for band in sim.bands)
 
     for band in sim.bands:
         # Only select non-satellite lines to reduce the amount of data on screen.
-        lines: list[Line] = [line for line in band.lines if not line.is_satellite]
-
-        for line in lines:
-            wavelength: float = utils.wavenum_to_wavelen(line.wavenumber)
-            intensity: float = line.intensity / max_intensity
-            text: pg.TextItem = pg.TextItem(
-                f"{line.branch_name}_{line.branch_idx_up}{line.branch_idx_lo}",
-                color="w",
-                anchor=(0.5, 1.2),
-            )
+        is_main: NDArray[np.bool_] = ~band.is_satellite
+        wavelengths: NDArray[np.float64] = utils.wavenum_to_wavelen(band.wavenumbers[is_main])
+        intensities: NDArray[np.float64] = band.intensities[is_main]
+        intensities /= max_intensity
+
+        # The labels are assembled column-wise from the band's arrays, and everything is converted
+        # to plain Python objects once so that the loop does not box NumPy scalars per line.
+        labels: NDArray[np.str_] = np.char.add(
+            np.char.add(
+                np.char.add(band.branch_name[is_main], "_"),
+                band.branch_idx_up[is_main].astype(str),
+            ),
+            band.branch_idx_lo[is_main].astype(str),
+        )
+
+        for label, wavelength, intensity in zip(
+            labels.tolist(), wavelengths.tolist(), intensities.tolist(), strict=True
+        ):
+            text: pg.TextItem = pg.TextItem(label, color="w", anchor=(0.5, 1.2))
             plot_widget.addItem(text)
             text.setPos(wavelength, intensity)
 
@@ -138,30 +154,31 @@ def plot_conv_sep(
     # Need to convolve all bands separately, get their maximum intensities, store the largest, and
     # then divide all bands by that maximum. If the max intensity was found for all bands convolved
     # together, it would be inaccurate because of vibrational band overlap.
-    max_intensity: float = max(
-        band.intensities_conv(
-            fwhm_selections,
-            inst_broadening_wl,
-            band.wavenumbers_conv(inst_broadening_wl, granularity),
-        ).max()
-        for band in sim.bands
-    )
+    band_data: list[tuple[NDArray[np.float64], NDArray[np.float64]]] = []
 
-    for idx, band in enumerate(sim.bands):
-        wavelengths_conv: NDArray[np.float64] = utils.wavenum_to_wavelen(
-            band.wavenumbers_conv(inst_broadening_wl, granularity)
+    for band in sim.bands:
+        wavenumbers_conv: NDArray[np.float64] = band.wavenumbers_conv(
+            inst_broadening_wl, granularity
         )
-        intensities_conv: NDArray[np.float64] = band.intensities_conv(
-            fwhm_selections,
-            inst_broadening_wl,
-            band.wavenumbers_conv(inst_broadening_wl, granularity),
+        band_data.append(
+            (
+                wavenumbers_conv,
+                band.intensities_conv(fwhm_selections, inst_broadening_wl, wavenumbers_conv),
+            )
         )
 
+    max_intensity: float = max(intensities_conv.max() for _, intensities_conv in band_data)
+
+    for idx, (band, (wavenumbers_conv, intensities_conv)) in enumerate(
+        zip(sim.bands, band_data, strict=True)
+    ):
         plot_widget.plot(
-            wavelengths_conv,
-            intensities_conv / max_intensity,
+            utils.wavenum_to_wavelen(wavenumbers_conv),
+            np.divide(intensities_conv, max_intensity, dtype=PLOT_DTYPE),
             pen=pg.mkPen(colors[idx], width=PEN_WIDTH),
             name=f"{sim.molecule.name} {band.v_qn_up, band.v_qn_lo} conv",
+            skipFiniteCheck=True,
+            **CURVE_OPTIONS,
         )
 
 
@@ -190,7 +207,9 @@ def plot_conv_all(
 
     plot_widget.plot(
         wavelengths_conv,
-        intensities_conv / intensities_conv.max(),
+        np.divide(intensities_conv, intensities_conv.max(), dtype=PLOT_DTYPE),
         pen=pg.mkPen(colors[0], width=PEN_WIDTH),
         name=f"{sim.molecule.name} conv all",
+        skipFiniteCheck=True,
+        **CURVE_OPTIONS,
     )
@@ -31,6 +31,8 @@ from state import State
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
+    from band import Band
+
 
 def main() -> None:
     """Entry point."""
@@ -64,7 +66,8 @@ def main() -> None:
         fname=utils.get_data_path("data", "samples", "harvard_20.csv"), delimiter=",", skip_header=1
     )
     wns_samp: NDArray[np.float64] = sample[:, 0]
-    ins_samp: NDArray[np.float64] = sample[:, 1] / sample[:, 1].max()
+    ins_samp: NDArray[np.float64] = sample[:, 1]
+    ins_samp /= ins_samp.max()
 
     plt.plot(wns_samp, ins_samp, label="sample")
 
@@ -78,26 +81,26 @@ def main() -> None:
         "predissociation": True,
     }
 
+    # Convolve each band once on its own wavenumber grid.
+    band_data: list[tuple[Band, NDArray[np.float64], NDArray[np.float64]]] = []
+
+    for band in sim.bands:
+        wavenumbers_conv: NDArray[np.float64] = band.wavenumbers_conv(
+            inst_broadening_wl, granularity
+        )
+        intensities_conv: NDArray[np.float64] = band.intensities_conv(
+            fwhm_selections, inst_broadening_wl, wavenumbers_conv
+        )
+        band_data.append((band, wavenumbers_conv, intensities_conv))
+
     # Find the max intensity in all the bands.
-    max_intensity: float = max(
-        band.intensities_conv(
-            fwhm_selections,
-            inst_broadening_wl,
-            band.wavenumbers_conv(inst_broadening_wl, granularity),
-        ).max()
-        for band in sim.bands
-    )
+    max_intensity: float = max(intensities_conv.max() for _, _, intensities_conv in band_data)
 
     # Plot all bands normalized to one while conserving the relative intensities between bands.
-    for band in sim.bands:
+    for band, wavenumbers_conv, intensities_conv in band_data:
         plt.plot(
-            band.wavenumbers_conv(inst_broadening_wl, granularity),
-            band.intensities_conv(
-                fwhm_selections,
-                inst_broadening_wl,
-                band.wavenumbers_conv(inst_broadening_wl, granularity),
-            )
-            / max_intensity,
+            wavenumbers_conv,
+            intensities_conv / max_intensity,
             label=f"band: {band.v_qn_up, band.v_qn_lo}",
         )
 
@@ -108,9 +111,11 @@ def main() -> None:
     plt.plot(wns, ins, label="all convolved")
 
     # Interpolate simulated data to have the same number of points as the experimental data and
-    # compute the residual.
-    ins_inrp: NDArray[np.float64] = np.interp(sample[:, 0], wns, ins)
-    residual: NDArray[np.float64] = np.abs(ins_samp - ins_inrp)
+    # compute the residual. The common wavenumber grid is created with `np.linspace`, so it is
+    # already sorted as `np.interp` requires. The residual overwrites the interpolated values.
+    residual: NDArray[np.float64] = np.interp(wns_samp, wns, ins)
+    np.subtract(ins_samp, residual, out=residual)
+    np.abs(residual, out=residual)
 
     # Show residual below the main data for clarity.
     plt.plot(wns_samp, -residual, label="residual")
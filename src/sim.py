@@ -16,8 +16,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+
 import numpy as np
-import polars as pl
 from numpy.typing import NDArray
 
 import constants
@@ -29,6 +33,45 @@ from simtype import SimType
 from state import State
 
 
+@cache
+def load_table(*path_parts: str) -> NDArray[np.float64]:
+    """Return a numeric table stored as a comma-separated file in the data directory.
+
+    Tables are only read from disk the first time they are requested, after which the same
+    read-only array is shared by every simulation.
+
+    Args:
+        *path_parts (str): Parts of the file path relative to the data directory.
+
+    Returns:
+        NDArray[np.float64]: The parsed table.
+    """
+    table: NDArray[np.float64] = np.loadtxt(utils.get_data_path("data", *path_parts), delimiter=",")
+    table.flags.writeable = False
+
+    return table
+
+
+@cache
+def load_columns(*path_parts: str) -> dict[str, NDArray[np.float64]]:
+    """Return the named columns of a numeric table with a header row in the data directory.
+
+    Like `load_table`, the file is only parsed the first time it is requested.
+
+    Args:
+        *path_parts (str): Parts of the file path relative to the data directory.
+
+    Returns:
+        dict[str, NDArray[np.float64]]: The read-only columns of the table, keyed by header name.
+    """
+    table: NDArray[np.void] = np.genfromtxt(
+        utils.get_data_path("data", *path_parts), delimiter=",", names=True
+    )
+    table.flags.writeable = False
+
+    return {name: table[name] for name in table.dtype.names}
+
+
 class Sim:
     """Simulate the spectra of a particular molecule."""
 
@@ -71,22 +114,107 @@ class Sim:
         self.temp_vib: float = temp_vib
         self.temp_rot: float = temp_rot
         self.pressure: float = pressure
+
+        # The factor hc/kT in [cm] converts term values in [1/cm] into Boltzmann exponents. It is
+        # computed once for each temperature here instead of in every Boltzmann factor.
+        self.beta_elc: float = constants.PLANC * constants.LIGHT / (constants.BOLTZ * temp_elc)
+        self.beta_vib: float = constants.PLANC * constants.LIGHT / (constants.BOLTZ * temp_vib)
+        self.beta_rot: float = constants.PLANC * constants.LIGHT / (constants.BOLTZ * temp_rot)
+
         self.elc_part: float = self.get_elc_partition_fn()
         self.vib_part: float = self.get_vib_partition_fn()
+        self.vib_boltz_fracs: NDArray[np.float64] = self.get_vib_boltz_fracs()
         self.elc_boltz_frac: float = self.get_elc_boltz_frac()
         self.franck_condon: NDArray[np.float64] = self.get_franck_condon()
         self.einstein: NDArray[np.float64] = self.get_einstein()
-        self.predissociation: dict[str, list[float]] = self.get_predissociation()
+        self.predissociation: dict[str, NDArray[np.float64]] = self.get_predissociation()
+        self.line_index: dict[str, NDArray] = self.get_line_index()
+        self.honl_london_factors: NDArray[np.float64] = self.get_honl_london_factors()
+
+        # Rotational term values only depend on the electronic state and vibrational level, so they
+        # are shared by every band with the same upper or lower vibrational quantum number.
+        self.rot_terms_cache: dict[tuple[bool, int], NDArray[np.float64]] = {}
+
+        # Likewise, the rotational Boltzmann fractions only depend on the vibrational level of the
+        # state that sets the line populations, so they are shared by all bands from that level.
+        self.rot_boltz_cache: dict[int, NDArray[np.float64]] = {}
+
+        # The wavenumber grid used to superimpose all bands is memoized for the same reason as the
+        # convolved data of each band.
+        self.conv_cache: dict[tuple[float, int], NDArray[np.float64]] = {}
+
         self.bands: list[Band] = self.get_bands(bands)
 
+    def rotational_terms(self, is_upper: bool, v_qn: int) -> NDArray[np.float64]:
+        """Return the rotational term value of each line in [1/cm].
+
+        Args:
+            is_upper (bool): True for the upper electronic state, False for the lower.
+            v_qn (int): Vibrational quantum number v.
+
+        Returns:
+            NDArray[np.float64]: The rotational term values of the rotational lines in [1/cm].
+        """
+        key: tuple[bool, int] = (is_upper, v_qn)
+
+        if key not in self.rot_terms_cache:
+            if is_upper:
+                rot_terms = terms.rotational_term(
+                    self.state_up,
+                    v_qn,
+                    self.line_index["j_qn_up"],
+                    self.line_index["branch_idx_up"],
+                )
+            else:
+                rot_terms = terms.rotational_term(
+                    self.state_lo,
+                    v_qn,
+                    self.line_index["j_qn_lo"],
+                    self.line_index["branch_idx_lo"],
+                )
+
+            rot_terms.flags.writeable = False
+            self.rot_terms_cache[key] = rot_terms
+
+        return self.rot_terms_cache[key]
+
+    def rot_boltz_fracs(self, v_qn: int) -> NDArray[np.float64]:
+        """Return the rotational Boltzmann fraction, N_J / N, of each line.
+
+        Args:
+            v_qn (int): Vibrational quantum number v of the state that sets the line populations.
+
+        Returns:
+            NDArray[np.float64]: The rotational Boltzmann fractions, N_J / N.
+        """
+        if v_qn not in self.rot_boltz_cache:
+            match self.sim_type:
+                case SimType.EMISSION:
+                    is_upper = True
+                    j_qn = self.line_index["j_qn_up"]
+                case SimType.ABSORPTION:
+                    is_upper = False
+                    j_qn = self.line_index["j_qn_lo"]
+
+            rot_boltz_fracs: NDArray[np.float64] = (
+                (2 * j_qn + 1)
+                * np.exp(-self.beta_rot * self.rotational_terms(is_upper, v_qn))
+                / self.get_rot_partition_fn(v_qn)
+            )
+
+            rot_boltz_fracs.flags.writeable = False
+            self.rot_boltz_cache[v_qn] = rot_boltz_fracs
+
+        return self.rot_boltz_cache[v_qn]
+
     def all_line_data(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
         """Combine the line data for all vibrational bands."""
-        wavenumbers_line: NDArray[np.float64] = np.array([])
-        intensities_line: NDArray[np.float64] = np.array([])
-
-        for band in self.bands:
-            wavenumbers_line = np.concatenate((wavenumbers_line, band.wavenumbers_line()))
-            intensities_line = np.concatenate((intensities_line, band.intensities_line()))
+        wavenumbers_line: NDArray[np.float64] = np.concatenate(
+            [band.wavenumbers_line() for band in self.bands]
+        )
+        intensities_line: NDArray[np.float64] = np.concatenate(
+            [band.intensities_line() for band in self.bands]
+        )
 
         return wavenumbers_line, intensities_line
 
@@ -99,42 +227,81 @@ class Sim:
         # Collision-Broadened and Overlapped Spectral Lines to Obtain Individual Line Parameters" by
         # BelBruno (1981).
 
-        # The total span of wavenumbers from all bands.
-        wavenumbers_line: NDArray[np.float64] = np.concatenate(
-            [band.wavenumbers_line() for band in self.bands]
+        # Create common wavenumber and intensity grids to hold all of the vibrational band data.
+        wavenumbers_conv: NDArray[np.float64] = self.wavenumbers_conv(
+            inst_broadening_wl, granularity
+        )
+        intensities_conv: NDArray[np.float64] = np.zeros_like(wavenumbers_conv)
+
+        band_conv: partial[NDArray[np.float64]] = partial(
+            Band.intensities_conv,
+            fwhm_selections=fwhm_selections,
+            inst_broadening_wl=inst_broadening_wl,
+            wavenumbers_conv=wavenumbers_conv,
         )
 
+        # Each band is convolved independently, and nearly all of the work is done inside NumPy and
+        # SciPy routines that release the GIL, so the bands are convolved in parallel threads.
+        num_workers: int = min(len(self.bands), os.process_cpu_count() or 1)
+
+        if num_workers > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                bands_conv: list[NDArray[np.float64]] = list(executor.map(band_conv, self.bands))
+        else:
+            bands_conv = [band_conv(band) for band in self.bands]
+
+        # The wavelength axis is common to all vibrational bands so that their contributions to the
+        # spectra can be summed. The bands are always summed in the same order so that the result
+        # does not depend on which thread finished first.
+        for intensities_band in bands_conv:
+            intensities_conv += intensities_band
+
+        return wavenumbers_conv, intensities_conv
+
+    def wavenumbers_conv(self, inst_broadening_wl: float, granularity: int) -> NDArray[np.float64]:
+        """Return the wavenumber grid shared by all vibrational bands.
+
+        Args:
+            inst_broadening_wl (float): Instrument broadening FWHM in [nm].
+            granularity (int): Number of points on the wavenumber axis.
+
+        Returns:
+            NDArray[np.float64]: A continuous range of wavenumbers spanning every band.
+        """
+        key: tuple[float, int] = (inst_broadening_wl, granularity)
+
+        if key in self.conv_cache:
+            return self.conv_cache[key]
+
         # A qualitative amount of padding added to either side of the x-axis limits. Ensures that
         # spectral features at either extreme are not clipped when the FWHM parameters are large.
-        # The first line's Doppler FWHM is chosen as an arbitrary reference to keep things simple.
-        # The minimum Gaussian FWHM allowed is 2 to ensure that no clipping is encountered.
+        # The first line's instrument FWHM is chosen as an arbitrary reference to keep things
+        # simple. The minimum Gaussian FWHM allowed is 2 to ensure that no clipping is encountered.
         padding: float = 10.0 * max(
-            self.bands[0].lines[0].fwhm_instrument(True, inst_broadening_wl), 2
+            utils.bandwidth_wavelen_to_wavenum(
+                utils.wavenum_to_wavelen(self.bands[0].wavenumbers[0]), inst_broadening_wl
+            ),
+            2,
         )
 
-        grid_min: float = wavenumbers_line.min() - padding
-        grid_max: float = wavenumbers_line.max() + padding
+        # The total span of wavenumbers from all bands.
+        grid_min: float = min(band.wavenumbers.min() for band in self.bands) - padding
+        grid_max: float = max(band.wavenumbers.max() for band in self.bands) + padding
 
-        # Create common wavenumber and intensity grids to hold all of the vibrational band data.
         wavenumbers_conv: NDArray[np.float64] = np.linspace(
             grid_min, grid_max, granularity, dtype=np.float64
         )
-        intensities_conv: NDArray[np.float64] = np.zeros_like(wavenumbers_conv)
 
-        # The wavelength axis is common to all vibrational bands so that their contributions to the
-        # spectra can be summed.
-        for band in self.bands:
-            intensities_conv += band.intensities_conv(
-                fwhm_selections, inst_broadening_wl, wavenumbers_conv
-            )
+        # The grid is shared with every caller, so it is made read-only to prevent accidental
+        # modification.
+        wavenumbers_conv.flags.writeable = False
+        self.conv_cache[key] = wavenumbers_conv
 
-        return wavenumbers_conv, intensities_conv
+        return wavenumbers_conv
 
-    def get_predissociation(self) -> dict[str, list[float]]:
+    def get_predissociation(self) -> dict[str, NDArray[np.float64]]:
         """Return polynomial coefficients for computing predissociation linewidths."""
-        return pl.read_csv(
-            utils.get_data_path("data", self.molecule.name, "predissociation", "lewis_coeffs.csv")
-        ).to_dict(as_series=False)
+        return load_columns(self.molecule.name, "predissociation", "lewis_coeffs.csv")
 
     def get_einstein(self) -> NDArray[np.float64]:
         """Return a table of Einstein coefficients for spontaneous emission: A_{v'v''}.
@@ -142,14 +309,10 @@ class Sim:
         Rows correspond to the upper state vibrational quantum number (v'), while columns correspond
         to the lower state vibrational quantum number (v'').
         """
-        return np.loadtxt(
-            utils.get_data_path(
-                "data",
-                self.molecule.name,
-                "einstein",
-                f"{self.state_up.name}_to_{self.state_lo.name}_laux.csv",
-            ),
-            delimiter=",",
+        return load_table(
+            self.molecule.name,
+            "einstein",
+            f"{self.state_up.name}_to_{self.state_lo.name}_laux.csv",
         )
 
     def get_franck_condon(self) -> NDArray[np.float64]:
@@ -158,16 +321,143 @@ class Sim:
         Rows correspond to the upper state vibrational quantum number (v'), while columns correspond
         to the lower state vibrational quantum number (v'').
         """
-        return np.loadtxt(
-            utils.get_data_path(
-                "data",
-                self.molecule.name,
-                "franck-condon",
-                f"{self.state_up.name}_to_{self.state_lo.name}_cheung.csv",
+        return load_table(
+            self.molecule.name,
+            "franck-condon",
+            f"{self.state_up.name}_to_{self.state_lo.name}_cheung.csv",
+        )
+
+    def get_honl_london_factors(self) -> NDArray[np.float64]:
+        """Return the Hönl-London (line strength) factor of each line.
+
+        The factors only depend on the rotational quantum numbers and branches, so they are shared
+        by every vibrational band in the simulation.
+
+        Returns:
+            NDArray[np.float64]: The Hönl-London (line strength) factors.
+        """
+        # For emission, the relevant rotational quantum number is N'; for absorption, it's N''.
+        match self.sim_type:
+            case SimType.EMISSION:
+                n_qn = self.line_index["n_qn_up"]
+            case SimType.ABSORPTION:
+                n_qn = self.line_index["n_qn_lo"]
+
+        # Convert the properties of each rotational line into a useful key. For main branches, the
+        # upper and lower branches indicies are the same, so it doesn't matter which one is used.
+        idx_up: NDArray[np.str_] = self.line_index["branch_idx_up"].astype(str)
+        idx_lo: NDArray[np.str_] = self.line_index["branch_idx_lo"].astype(str)
+        keys: NDArray[np.str_] = np.where(
+            self.line_index["is_satellite"],
+            np.char.add(
+                np.char.add(self.line_index["branch_name"], "Q"), np.char.add(idx_up, idx_lo)
             ),
-            delimiter=",",
+            np.char.add(self.line_index["branch_name"], idx_up),
+        )
+
+        # These factors are from Tatum - 1966: Hönl-London Factors for 3Σ±-3Σ± Transitions. Every
+        # factor is evaluated for every line, so factors belonging to other branches are allowed to
+        # divide by zero since they are never selected.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factors: dict[SimType, dict[str, NDArray[np.float64]]] = {
+                SimType.EMISSION: {
+                    "P1": ((n_qn + 1) * (2 * n_qn + 5)) / (2 * n_qn + 3),
+                    "R1": (n_qn * (2 * n_qn + 3)) / (2 * n_qn + 1),
+                    "P2": (n_qn * (n_qn + 2)) / (n_qn + 1),
+                    "R2": ((n_qn - 1) * (n_qn + 1)) / n_qn,
+                    "P3": ((n_qn + 1) * (2 * n_qn - 1)) / (2 * n_qn + 1),
+                    "R3": (n_qn * (2 * n_qn - 3)) / (2 * n_qn - 1),
+                    "PQ12": 1 / (n_qn + 1),
+                    "RQ21": 1 / n_qn,
+                    "PQ13": 1 / ((n_qn + 1) * (2 * n_qn + 1) * (2 * n_qn + 3)),
+                    "RQ31": 1 / (n_qn * (2 * n_qn - 1) * (2 * n_qn + 1)),
+                    "PQ23": 1 / (n_qn + 1),
+                    "RQ32": 1 / n_qn,
+                },
+                SimType.ABSORPTION: {
+                    "P1": (n_qn * (2 * n_qn + 3)) / (2 * n_qn + 1),
+                    "R1": ((n_qn + 1) * (2 * n_qn + 5)) / (2 * n_qn + 3),
+                    "P2": ((n_qn - 1) * (n_qn + 1)) / n_qn,
+                    "R2": (n_qn * (n_qn + 2)) / (n_qn + 1),
+                    "P3": (n_qn * (2 * n_qn - 3)) / (2 * n_qn - 1),
+                    "R3": ((n_qn + 1) * (2 * n_qn - 1)) / (2 * n_qn + 1),
+                    "PQ12": 1 / n_qn,
+                    "RQ21": 1 / (n_qn + 1),
+                    "PQ13": 1 / (n_qn * (2 * n_qn - 1) * (2 * n_qn + 1)),
+                    "RQ31": 1 / ((n_qn + 1) * (2 * n_qn + 1) * (2 * n_qn + 3)),
+                    "PQ23": 1 / n_qn,
+                    "RQ32": 1 / (n_qn + 1),
+                },
+            }
+
+        branch_factors: dict[str, NDArray[np.float64]] = factors[self.sim_type]
+
+        return np.select([keys == key for key in branch_factors], list(branch_factors.values()))
+
+    def get_line_index(self) -> dict[str, NDArray]:
+        """Return the quantum numbers of all allowed rotational lines.
+
+        The allowed lines depend only on the rotational levels and the electronic states, so they
+        are computed once here and shared by every vibrational band in the simulation.
+        """
+        # For Σ-Σ transitions, the rotational selection rules are ∆N = ±1, ∆N ≠ 0.
+        # Herzberg p. 244, eq. (V, 44)
+
+        # Determine how many lines should be present in the fine structure of the molecule due to
+        # the effects of spin multiplicity.
+        if self.state_up.spin_multiplicity != self.state_lo.spin_multiplicity:
+            raise ValueError("Spin multiplicity of the two electronic states do not match.")
+
+        branch_range: NDArray[np.int64] = np.arange(1, self.state_up.spin_multiplicity + 1)
+
+        # Ensure the rotational selection rules corresponding to each electronic state are properly
+        # followed. Forbidden levels are removed up front so that they never enter the grid below.
+        rot_lvls_up: NDArray[np.int64] = self.rot_lvls[self.state_up.is_allowed(self.rot_lvls)]
+        rot_lvls_lo: NDArray[np.int64] = self.rot_lvls[self.state_lo.is_allowed(self.rot_lvls)]
+
+        # Herzberg pp. 249-251, eqs. (V, 48-53)
+
+        # Main branches: R1, R2, R3, P1, P2, P3. Satellite branches: RQ21, RQ31, RQ32, PQ12, PQ13,
+        # PQ23. Note that the Q branch doesn't exist for the Schumann-Runge bands of O2. Which
+        # branches exist does not depend on N', so the branch rules are evaluated once on the small
+        # table of ∆N and branch index combinations. The ∆N axis is ordered as R, Q, P so that lines
+        # are sorted by N', then N'', then branch index.
+        branch_delta, branch_up, branch_lo = np.meshgrid(
+            np.array([1, 0, -1]), branch_range, branch_range, indexing="ij"
+        )
+        is_main: NDArray[np.bool_] = branch_up == branch_lo
+        is_branch: NDArray[np.bool_] = (
+            ((branch_delta == 1) & (is_main | (branch_up > branch_lo)))
+            | ((branch_delta == 0) & is_main)
+            | ((branch_delta == -1) & (is_main | (branch_up < branch_lo)))
+        )
+
+        # Every combination of N' with the branches that exist.
+        num_branches: int = np.count_nonzero(is_branch)
+        n_qn_up: NDArray[np.int64] = np.repeat(rot_lvls_up, num_branches)
+        delta_n_qn: NDArray[np.int64] = np.tile(branch_delta[is_branch], rot_lvls_up.size)
+        branch_idx_up: NDArray[np.int64] = np.tile(branch_up[is_branch], rot_lvls_up.size)
+        branch_idx_lo: NDArray[np.int64] = np.tile(branch_lo[is_branch], rot_lvls_up.size)
+        n_qn_lo: NDArray[np.int64] = n_qn_up - delta_n_qn
+
+        # NOTE: 24/10/16 - Every transition has 6 total lines (3 main + 3 satellite) except for the
+        #       N' = 0 to N'' = 1 transition, which has 3 total lines (1 main + 2 satellite). Only
+        #       the F1 level exists for N' = 0, so only the P1, PQ12, and PQ13 lines are kept.
+        mask: NDArray[np.bool_] = np.isin(n_qn_lo, rot_lvls_lo) & (
+            (n_qn_up != 0) | (branch_idx_up == 1)
         )
 
+        return {
+            "n_qn_up": n_qn_up[mask],
+            "n_qn_lo": n_qn_lo[mask],
+            "j_qn_up": utils.n_to_j(n_qn_up[mask], branch_idx_up[mask]),
+            "j_qn_lo": utils.n_to_j(n_qn_lo[mask], branch_idx_lo[mask]),
+            "branch_idx_up": branch_idx_up[mask],
+            "branch_idx_lo": branch_idx_lo[mask],
+            "branch_name": np.array(["P", "Q", "R"])[delta_n_qn[mask] + 1],
+            "is_satellite": branch_idx_up[mask] != branch_idx_lo[mask],
+        }
+
     def get_bands(self, bands: list[tuple[int, int]]):
         """Return the selected vibrational bands within the simulation."""
         return [Band(sim=self, v_qn_up=band[0], v_qn_lo=band[1]) for band in bands]
@@ -179,49 +469,102 @@ class Sim:
         match self.sim_type:
             case SimType.EMISSION:
                 state = self.state_up
-                v_qn_max = len(self.state_up.constants["G"])
             case SimType.ABSORPTION:
                 state = self.state_lo
-                v_qn_max = len(self.state_lo.constants["G"])
-
-        q_v: float = 0.0
 
         # NOTE: 24/10/22 - The vibrational partition function is always computed using a set number
         #       of vibrational bands to ensure an accurate estimate of the state sum is obtained.
         #       This approach is used to ensure the sum is calculated correctly regardless of the
         #       number of vibrational bands simulated by the user.
-        for v_qn in range(0, v_qn_max):
-            # NOTE: 24/10/25 - The zero-point vibrational energy is used as a reference to which all
-            #       other vibrational energies are measured. This ensures the state sum begins at a
-            #       value of 1 when v = 0.
-            q_v += np.exp(
-                -(terms.vibrational_term(state, v_qn) - terms.vibrational_term(state, 0))
-                * constants.PLANC
-                * constants.LIGHT
-                / (constants.BOLTZ * self.temp_vib)
-            )
+        vib_terms: NDArray[np.float64] = np.asarray(state.constants["G"], dtype=np.float64)
+
+        # NOTE: 24/10/25 - The zero-point vibrational energy is used as a reference to which all
+        #       other vibrational energies are measured. This ensures the state sum begins at a
+        #       value of 1 when v = 0.
+        return float(np.exp(-(vib_terms - vib_terms[0]) * self.beta_vib).sum())
+
+    def get_vib_boltz_fracs(self) -> NDArray[np.float64]:
+        """Return the vibrational Boltzmann fraction, N_v / N, of each vibrational level."""
+        match self.sim_type:
+            case SimType.EMISSION:
+                state = self.state_up
+            case SimType.ABSORPTION:
+                state = self.state_lo
+
+        vib_terms: NDArray[np.float64] = state.constants["G"]
+
+        # NOTE: 24/10/25 - Calculates the vibrational Boltzmann fraction with respect to the
+        #       zero-point vibrational energy to match the vibrational partition function.
+        return np.exp(-(vib_terms - vib_terms[0]) * self.beta_vib) / self.vib_part
+
+    def get_rot_partition_fn(self, v_qn: int) -> float:
+        """Return the rotational partition function, Q_r.
+
+        Args:
+            v_qn (int): Vibrational quantum number v of the state that sets the line populations.
+
+        Returns:
+            float: The rotational partition function, Q_r.
+        """
+        # TODO: 24/10/25 - Add nuclear effects to make this the effective rotational partition
+        #       function.
+
+        match self.sim_type:
+            case SimType.EMISSION:
+                state = self.state_up
+            case SimType.ABSORPTION:
+                state = self.state_lo
+
+        # NOTE: 24/10/22 - The rotational partition function is always computed using the same
+        #       number of lines. At reasonable temperatures (~300 K), only around 50 rotational
+        #       lines contribute to the state sum. However, at high temperatures (~3000 K), at least
+        #       100 lines need to be considered to obtain an accurate estimate of the state sum.
+        #       This approach is used to ensure the sum is calculated correctly regardless of the
+        #       number of rotational lines simulated by the user.
+        j_qn: NDArray[np.int64] = np.arange(201)
+
+        # TODO: 24/10/22 - Not sure which branch index should be used here. The triplet energies
+        #       are all close together, so it shouldn't matter too much. Averaging could work, but
+        #       I'm not sure if this is necessary.
+        boltz_factors: NDArray[np.float64] = np.exp(
+            -terms.rotational_term(state, v_qn, j_qn, 2) * self.beta_rot
+        )
+
+        # The state sum is the dot product of the degeneracies and the Boltzmann factors.
+        q_r: float = np.dot(2 * j_qn + 1, boltz_factors)
+
+        # NOTE: 24/10/22 - Alternatively, the high-temperature approximation can be used instead of
+        #       the direct sum approach. This also works well.
 
-        return q_v
+        # q_r = (
+        #     constants.BOLTZ
+        #     * self.temp_rot
+        #     / (constants.PLANC * constants.LIGHT * state.constants["B"][v_qn])
+        # )
+
+        # The state sum must be divided by the symmetry parameter to account for identical
+        # rotational orientations in space.
+        return q_r / self.molecule.symmetry_param
 
     def get_elc_partition_fn(self) -> float:
         """Return the electronic partition function."""
-        energies: list[float] = list(constants.ELECTRONIC_ENERGIES[self.molecule.name].values())
-        degeneracies: list[int] = list(
-            constants.ELECTRONIC_DEGENERACIES[self.molecule.name].values()
+        energies: NDArray[np.float64] = np.fromiter(
+            constants.ELECTRONIC_ENERGIES[self.molecule.name].values(), dtype=np.float64
+        )
+        degeneracies: NDArray[np.int64] = np.fromiter(
+            constants.ELECTRONIC_DEGENERACIES[self.molecule.name].values(), dtype=np.int64
         )
-
-        q_e: float = 0.0
 
         # NOTE: 24/10/25 - This sum is basically unnecessary since the energies of electronic states
         #       above the ground state are so high. This means that any contribution to the
         #       electronic partition function from anything other than the ground state is
         #       negligible.
-        for e, g in zip(energies, degeneracies):
-            q_e += g * np.exp(
-                -e * constants.PLANC * constants.LIGHT / (constants.BOLTZ * self.temp_elc)
+        return float(
+            np.dot(
+                degeneracies,
+                np.exp(-energies * self.beta_elc),
             )
-
-        return q_e
+        )
 
     def get_elc_boltz_frac(self) -> float:
         """Return the electronic Boltzmann fraction N_e / N."""
@@ -234,10 +577,4 @@ class Sim:
         energy: float = constants.ELECTRONIC_ENERGIES[self.molecule.name][state]
         degeneracy: int = constants.ELECTRONIC_DEGENERACIES[self.molecule.name][state]
 
-        return (
-            degeneracy
-            * np.exp(
-                -energy * constants.PLANC * constants.LIGHT / (constants.BOLTZ * self.temp_elc)
-            )
-            / self.elc_part
-        )
+        return degeneracy * math.exp(-energy * self.beta_elc) / self.elc_part
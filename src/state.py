@@ -16,7 +16,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import numpy as np
 import polars as pl
+from numpy.typing import NDArray
 
 import utils
 from molecule import Molecule
@@ -36,40 +38,91 @@ class State:
         self.name: str = name
         self.spin_multiplicity: int = spin_multiplicity
         self.molecule: Molecule = molecule
-        self.constants: dict[str, list[float]] = self.get_constants(molecule.name, name)
+        self.constants: dict[str, NDArray[np.float64]] = self.get_constants(molecule.name, name)
+        self.rot_constants: list[tuple[float, ...]] = self.get_rot_constants()
 
     @staticmethod
-    def get_constants(molecule: str, state: str) -> dict[str, list[float]]:
+    def get_constants(molecule: str, state: str) -> dict[str, NDArray[np.float64]]:
         """Return the molecular constants for the specified electronic state in [1/cm].
 
+        The constants are read once when the state is created and stored as NumPy arrays indexed by
+        the vibrational quantum number, so they can be indexed cheaply and used in vectorized
+        expressions without any further conversion.
+
         Args:
             molecule (str): Parent molecule.
             state (str): Name of the electronic state.
 
         Returns:
-            dict[str, list[float]]: A `dict` of molecular constants for the electronic state.
+            dict[str, NDArray[np.float64]]: A `dict` of molecular constants for the electronic
+                state.
+        """
+        df: pl.DataFrame = pl.read_csv(
+            utils.get_data_path("data", molecule, "states", f"{state}.csv")
+        )
+
+        return {name: df[name].to_numpy().astype(np.float64) for name in df.columns}
+
+    def get_rot_constants(self) -> list[tuple[float, ...]]:
+        """Return the rotational constants needed for the rotational term values of each level.
+
+        Rotational terms are computed for every vibrational level of the state many times over, so
+        the constants are gathered into one tuple of plain floats per level ahead of time instead of
+        being looked up and indexed separately on every call.
+
+        Returns:
+            list[tuple[float, ...]]: The constants B, D, lamda, gamma, lamda_D, and gamma_D in
+                [1/cm] using the convention of Cheung, indexed by the vibrational quantum number v.
         """
-        return pl.read_csv(utils.get_data_path("data", molecule, "states", f"{state}.csv")).to_dict(
-            as_series=False
+        d: NDArray[np.float64] = self.constants["D"]
+        ld: NDArray[np.float64] = self.constants["lamda_D"]
+        gd: NDArray[np.float64] = self.constants["gamma_D"]
+
+        # NOTE: 24/11/05 - The Hamiltonians in Cheung and Yu are defined slightly differently, which
+        #       leads to some constants having different values. Since the Cheung Hamiltonian matrix
+        #       elements are used to solve for the energy eigenvalues, the constants from Yu are
+        #       changed to fit the convention used by Cheung. See the table below for details.
+        #
+        #       Cheung  | Yu
+        #       --------|------------
+        #       D       | -D
+        #       lamda_D | 2 * lamda_D
+        #       gamma_D | 2 * gamma_D
+
+        if self.name == "X3Sg-":
+            d = -d
+            ld = 2 * ld
+            gd = 2 * gd
+
+        return list(
+            zip(
+                self.constants["B"].tolist(),
+                d.tolist(),
+                self.constants["lamda"].tolist(),
+                self.constants["gamma"].tolist(),
+                ld.tolist(),
+                gd.tolist(),
+                strict=True,
+            )
         )
 
-    def is_allowed(self, n_qn: int) -> bool:
-        """Return whether or not the selected rotational level is allowed.
+    def is_allowed(self, n_qn: NDArray[np.int64]) -> NDArray[np.bool_]:
+        """Return whether or not the selected rotational levels are allowed.
 
         Args:
-            n_qn (int): Rotational quantum number N.
+            n_qn (NDArray[np.int64]): Rotational quantum numbers N.
 
         Raises:
             ValueError: If the electronic state does not exist.
 
         Returns:
-            bool: True if the selected rotational level is allowed.
+            NDArray[np.bool_]: True where the selected rotational level is allowed.
         """
         if self.name == "X3Sg-":
             # For X3Σg-, only the rotational levels with odd N can be populated.
-            return bool(n_qn % 2 == 1)
+            return n_qn % 2 == 1
         if self.name == "B3Su-":
             # For B3Σu-, only the rotational levels with even N can be populated.
-            return bool(n_qn % 2 == 0)
+            return n_qn % 2 == 0
 
         raise ValueError(f"State {self.name} not supported.")
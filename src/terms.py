@@ -16,15 +16,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import TYPE_CHECKING
-
 import numpy as np
+from numpy.typing import NDArray
 
 from state import State
 
-if TYPE_CHECKING:
-    from numpy.typing import NDArray
-
 
 def vibrational_term(state: State, v_qn: int) -> float:
     """Return the vibrational term value in [1/cm].
@@ -39,72 +35,69 @@ def vibrational_term(state: State, v_qn: int) -> float:
     return state.constants["G"][v_qn]
 
 
-def rotational_term(state: State, v_qn: int, j_qn: int, branch_idx: int) -> float:
-    """Return the rotational term value in [1/cm].
+def rotational_term(
+    state: State, v_qn: int, j_qn: NDArray[np.int64], branch_idx: int | NDArray[np.int64]
+) -> NDArray[np.float64]:
+    """Return the rotational term values in [1/cm].
 
     Args:
         state (State): Electronic `State` object.
         v_qn (int): Vibrational quantum number v.
-        j_qn (int): Rotational quantum number J.
-        branch_idx (int): Branch index.
+        j_qn (NDArray[np.int64]): Rotational quantum numbers J.
+        branch_idx (int | NDArray[np.int64]): Branch indices, either one for each J or a single
+            index shared by all J.
 
     Raises:
         ValueError: If the branch index cannot be found.
 
     Returns:
-        float: The rotational term value in [1/cm].
+        NDArray[np.float64]: The rotational term values in [1/cm].
     """
-    lookup_table: dict[str, list[float]] = state.constants
-
-    b: float = lookup_table["B"][v_qn]
-    d: float = lookup_table["D"][v_qn]
-    l: float = lookup_table["lamda"][v_qn]
-    g: float = lookup_table["gamma"][v_qn]
-    ld: float = lookup_table["lamda_D"][v_qn]
-    gd: float = lookup_table["gamma_D"][v_qn]
-
-    # NOTE: 24/11/05 - The Hamiltonians in Cheung and Yu are defined slightly differently, which
-    #       leads to some constants having different values. Since the Cheung Hamiltonian matrix
-    #       elements are used to solve for the energy eigenvalues, the constants from Yu are changed
-    #       to fit the convention used by Cheung. See the table below for details.
-    #
-    #       Cheung  | Yu
-    #       --------|------------
-    #       D       | -D
-    #       lamda_D | 2 * lamda_D
-    #       gamma_D | 2 * gamma_D
-
-    if state.name == "X3Sg-":
-        d *= -1
-        ld *= 2
-        gd *= 2
+    if not np.all(np.isin(branch_idx, (1, 2, 3))):
+        raise ValueError(f"Invalid branch index: {branch_idx}")
+
+    # The constants of the X3Sg- state are converted to the convention of Cheung when the state is
+    # created, so they can be used directly with the Cheung Hamiltonian matrix elements.
+    b, d, l, g, ld, gd = state.rot_constants[v_qn]
 
     # The Hamiltonian from Cheung is written in Hund's case (a) representation, so J is used instead
     # of N.
-    x: int = j_qn * (j_qn + 1)
+    x: NDArray[np.int64] = j_qn * (j_qn + 1)
+
+    # The F2 component is not coupled to the other two, so the 2x2 Hamiltonian is skipped entirely
+    # when it is the only one requested (e.g. for the rotational partition function).
+    f2: NDArray[np.float64] = (b - d * x + 2 / 3 * ld - gd) * x + 2 / 3 * l - g
+
+    if isinstance(branch_idx, int) and branch_idx == 2:  # noqa: PLR2004
+        return f2
 
-    # The four Hamiltonian matrix elements given in Cheung.
-    h11: float = (
+    # The four Hamiltonian matrix elements given in Cheung, one set for each J.
+    # The polynomials in x are evaluated using Horner's method to minimize the number of operations.
+    h11: NDArray[np.float64] = (
         b * (x + 2)
-        - d * (x**2 + 8 * x + 4)
+        - d * ((x + 8) * x + 4)
         - 4 / 3 * l
         - 2 * g
         - 4 / 3 * ld * (x + 2)
         - 4 * gd * (x + 1)
     )
-    h12: float = -2 * np.sqrt(x) * (b - 2 * d * (x + 1) - g / 2 - 2 / 3 * ld - gd / 2 * (x + 4))
-    h21: float = h12
-    h22: float = b * x - d * (x**2 + 4 * x) + 2 / 3 * l - g + 2 / 3 * x * ld - 3 * x * gd
-
-    hamiltonian: NDArray[np.float64] = np.array([[h11, h12], [h21, h22]])
-    f1, f3 = np.linalg.eigvals(hamiltonian)
-
-    match branch_idx:
-        case 1:
-            return f1
-        case 2:
-            return b * x - d * x**2 + 2 / 3 * l - g + 2 / 3 * x * ld - x * gd
-        case 3:
-            return f3
-        case _:
-            raise ValueError(f"Invalid branch index: {branch_idx}")
+    h12: NDArray[np.float64] = (
+        -2 * np.sqrt(x) * (b - 2 * d * (x + 1) - g / 2 - 2 / 3 * ld - gd / 2 * (x + 4))
+    )
+    h21: NDArray[np.float64] = h12
+    h22: NDArray[np.float64] = (b - d * (x + 4) + 2 / 3 * ld - 3 * gd) * x + 2 / 3 * l - g
+
+    # The eigenvalues of each symmetric 2x2 Hamiltonian are found in closed form, which avoids
+    # calling LAPACK and guarantees real results. F1 is the eigenvalue that tends towards h11 as the
+    # off-diagonal elements vanish, and F3 the one that tends towards h22.
+    mean: NDArray[np.float64] = 0.5 * (h11 + h22)
+    half_diff: NDArray[np.float64] = 0.5 * (h11 - h22)
+    disc: NDArray[np.float64] = np.copysign(np.sqrt(half_diff**2 + h12 * h21), half_diff)
+
+    f1: NDArray[np.float64] = mean + disc
+    f3: NDArray[np.float64] = mean - disc
+
+    if isinstance(branch_idx, int):
+        return f1 if branch_idx == 1 else f3
+
+    return np.choose(np.asarray(branch_idx) - 1, [f1, f2, f3])
@@ -24,33 +24,37 @@ import numpy as np
 from numpy.typing import NDArray
 
 
-def n_to_j(n_qn: int, branch_idx: int) -> int:
+@overload
+def n_to_j(n_qn: int, branch_idx: int) -> int: ...
+
+
+@overload
+def n_to_j(n_qn: NDArray[np.int64], branch_idx: NDArray[np.int64]) -> NDArray[np.int64]: ...
+
+
+def n_to_j(
+    n_qn: int | NDArray[np.int64], branch_idx: int | NDArray[np.int64]
+) -> int | NDArray[np.int64]:
     """Convert the rotational quantum number from N to J.
 
     Args:
-        n_qn (int): Rotational quantum number N.
-        branch_idx (int): Branch index. The total number of branches (and therefore the conversion
-            from N to J) is dependent on the spin multiplicity of the molecule.
+        n_qn (int | NDArray[np.int64]): Rotational quantum number(s) N.
+        branch_idx (int | NDArray[np.int64]): Branch index. The total number of branches (and
+            therefore the conversion from N to J) is dependent on the spin multiplicity of the
+            molecule.
 
     Raises:
         ValueError: If the branch index cannot be found.
 
     Returns:
-        int: The rotational quantum number J.
+        int | NDArray[np.int64]: The rotational quantum number(s) J.
     """
     # For Hund's case (b), spin multiplicity 3.
-    match branch_idx:
-        case 1:
-            # F1: J = N + 1
-            return n_qn + 1
-        case 2:
-            # F2: J = N
-            return n_qn
-        case 3:
-            # F3: J = N - 1
-            return n_qn - 1
-        case _:
-            raise ValueError(f"Unknown branch index: {branch_idx}.")
+    if not np.all(np.isin(branch_idx, (1, 2, 3))):
+        raise ValueError(f"Unknown branch index: {branch_idx}.")
+
+    # F1: J = N + 1, F2: J = N, F3: J = N - 1
+    return n_qn + 2 - branch_idx
 
 
 @overload
@@ -70,21 +74,34 @@ def wavenum_to_wavelen(wavenumber: float | NDArray[np.float64]) -> float | NDArr
     Returns:
         float | NDArray[np.float64]: The corresponding wavelength(s) in [nm].
     """
-    return 1.0 / wavenumber * 1e7
+    return 1e7 / wavenumber
+
+
+@overload
+def bandwidth_wavelen_to_wavenum(center_wl: float, fwhm_wl: float) -> float: ...
+
+
+@overload
+def bandwidth_wavelen_to_wavenum(
+    center_wl: NDArray[np.float64], fwhm_wl: float
+) -> NDArray[np.float64]: ...
 
 
-def bandwidth_wavelen_to_wavenum(center_wl: float, fwhm_wl: float) -> float:
+def bandwidth_wavelen_to_wavenum(
+    center_wl: float | NDArray[np.float64], fwhm_wl: float
+) -> float | NDArray[np.float64]:
     """Convert a FWHM bandwidth from [nm] to [1/cm] given a center wavelength.
 
     Note that this is not a linear approximation, so it is accurate for large FWHM parameters. See
     https://toolbox.lightcon.com/tools/bandwidthconverter for details.
 
     Args:
-        center_wl (float): Center wavelength in [nm] around which the bandwidth is defined.
+        center_wl (float | NDArray[np.float64]): Center wavelength(s) in [nm] around which the
+            bandwidth is defined.
         fwhm_wl (float): FWHM bandwidth in [nm].
 
     Returns:
-        float: The FWHM bandwidth in [1/cm].
+        float | NDArray[np.float64]: The FWHM bandwidth(s) in [1/cm].
     """
     return 1e7 * fwhm_wl / (center_wl**2 - fwhm_wl**2 / 4)
 
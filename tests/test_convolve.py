@@ -0,0 +1,165 @@
+# module test_convolve.py
+"""Compares the convolved spectra against a direct sum of the line profiles."""
+
+# Copyright (C) 2023-2025 Nathan G. Phillips
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import convolve
+from atom import Atom
+from band import Band
+from molecule import Molecule
+from sim import Sim
+from simtype import SimType
+from state import State
+
+# Matches the default granularity of the GUI.
+GRANULARITY: int = int(1e4)
+
+# Maximum error allowed anywhere in the spectrum relative to its peak.
+TOLERANCE: float = 1e-2
+
+SELECTIONS: dict[str, dict[str, bool]] = {
+    "collisional": {
+        "instrument": False,
+        "doppler": False,
+        "natural": False,
+        "collisional": True,
+        "predissociation": False,
+    },
+    "doppler": {
+        "instrument": False,
+        "doppler": True,
+        "natural": False,
+        "collisional": False,
+        "predissociation": False,
+    },
+    "all": {
+        "instrument": True,
+        "doppler": True,
+        "natural": True,
+        "collisional": True,
+        "predissociation": True,
+    },
+}
+
+
+def direct_sum(
+    band: Band,
+    wavenumbers_conv: NDArray[np.float64],
+    fwhm_selections: dict[str, bool],
+    inst_broadening_wl: float,
+) -> NDArray[np.float64]:
+    """Return the spectrum of a band by evaluating the profile of every line over the whole grid.
+
+    Args:
+        band (Band): The vibrational band containing the rotational lines.
+        wavenumbers_conv (NDArray[np.float64]): A continuous array of wavenumbers.
+        fwhm_selections (dict[str, bool]): The types of broadening to be simulated.
+        inst_broadening_wl (float): Instrument broadening FWHM in [nm].
+
+    Returns:
+        NDArray[np.float64]: The total intensity spectrum with contributions from all lines.
+    """
+    fwhm_gaussian: NDArray[np.float64] = np.sqrt(
+        band.fwhm_instrument(fwhm_selections["instrument"], inst_broadening_wl) ** 2
+        + band.fwhm_doppler(fwhm_selections["doppler"]) ** 2
+    )
+    fwhm_lorentzian: NDArray[np.float64] = np.broadcast_to(
+        band.fwhm_natural(fwhm_selections["natural"])
+        + band.fwhm_collisional(fwhm_selections["collisional"])
+        + band.fwhm_predissociation(fwhm_selections["predissociation"]),
+        fwhm_gaussian.shape,
+    )
+
+    intensities_conv: NDArray[np.float64] = np.zeros_like(wavenumbers_conv)
+
+    for wavenumber, intensity, fwhm_g, fwhm_l in zip(
+        band.wavenumbers, band.intensities, fwhm_gaussian, fwhm_lorentzian, strict=True
+    ):
+        intensities_conv += intensity * convolve.broadening_fn(
+            wavenumbers_conv, wavenumber, float(fwhm_g), float(fwhm_l)
+        )
+
+    return intensities_conv
+
+
+class TestConvolve(unittest.TestCase):
+    """Checks the binned FFT convolution against the direct sum at the default granularity."""
+
+    def setUp(self) -> None:
+        """Create the states used by every simulation."""
+        self.molecule: Molecule = Molecule("O2", Atom("O"), Atom("O"))
+        self.state_up: State = State("B3Su-", 3, self.molecule)
+        self.state_lo: State = State("X3Sg-", 3, self.molecule)
+
+    def check_peaks(self, bands: list[tuple[int, int]], inst_broadening_wl: float) -> None:
+        """Compare the convolved spectrum of a set of bands against the direct sum.
+
+        Args:
+            bands (list[tuple[int, int]]): The vibrational bands to simulate.
+            inst_broadening_wl (float): Instrument broadening FWHM in [nm].
+        """
+        for name, fwhm_selections in SELECTIONS.items():
+            with self.subTest(bands=bands, broadening=name):
+                sim: Sim = Sim(
+                    SimType.ABSORPTION,
+                    self.molecule,
+                    self.state_up,
+                    self.state_lo,
+                    np.arange(0, 40),
+                    300.0,
+                    300.0,
+                    300.0,
+                    300.0,
+                    101325.0,
+                    bands,
+                )
+
+                wavenumbers_conv, intensities_conv = sim.all_conv_data(
+                    fwhm_selections, inst_broadening_wl, GRANULARITY
+                )
+                expected: NDArray[np.float64] = sum(
+                    direct_sum(band, wavenumbers_conv, fwhm_selections, inst_broadening_wl)
+                    for band in sim.bands
+                )
+
+                self.assertAlmostEqual(
+                    intensities_conv.max() / expected.max(), 1.0, delta=TOLERANCE
+                )
+                self.assertLess(
+                    np.abs(intensities_conv - expected).max() / expected.max(), TOLERANCE
+                )
+
+    def test_single_band(self) -> None:
+        """A single band with lines only a few grid points wide."""
+        self.check_peaks([(2, 0)], 0.0)
+
+    def test_multiple_bands(self) -> None:
+        """Several bands sharing a coarse grid, with and without instrument broadening."""
+        self.check_peaks([(2, 0), (4, 1), (0, 5)], 0.0)
+        self.check_peaks([(2, 0), (4, 1), (0, 5)], 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()